@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+"""
+Benchmark a Client end to end against a local mock of the GitHub API.
+
+Starts benchmarks.server with the given `--latency`, then measures the
+throughput and peak memory of fetching and parsing the recorded resources,
+of accessing their attributes, of paginating `--pages` pages of a synthetic
+list, and of fanning out requests for many users. Nothing is sent outside
+of localhost, so runs are reproducible and can be compared before a release.
+
+Usage: python -m benchmarks.bench_client [--latency 0.005] [--pages 200]
+       [--users 200] [--number 200]
+"""
+
+import argparse
+import gc
+import timeit
+import tracemalloc
+
+import octokit
+
+from .server import MockGitHub
+
+
+def measure_memory(func):
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def report(label, seconds, count, unit, peak=None):
+    line = '%-40s %10.1f ms %12.1f %s/s' % (label, seconds * 1e3,
+                                            count / seconds, unit)
+    if peak is not None:
+        line += ' %10.1f MiB peak' % (peak / 2.0 ** 20)
+    print(line)
+
+
+def bench(label, func, count, unit, repeat=3, memory=False):
+    seconds = min(timeit.repeat(func, number=1, repeat=repeat))
+    peak = measure_memory(func) if memory else None
+    report(label, seconds, count, unit, peak)
+
+
+def bench_resources(server, args):
+    client = octokit.Client(api_endpoint=server.url)
+    client.get()
+    user = client.user
+
+    def fetch():
+        for _ in range(args.number):
+            user('api-padawan')
+    bench('fetch and parse user', fetch, args.number, 'req')
+
+    resource = user('api-padawan')
+    fields = ('login', 'id', 'name', 'company', 'public_repos', 'followers',
+              'created_at', 'repos', 'followers', 'gists')
+
+    def access():
+        for _ in range(args.number * 100):
+            for field in fields:
+                getattr(resource, field)
+    bench('attribute access', access, args.number * 100 * len(fields),
+          'attr')
+
+
+def bench_pagination(server, args):
+    items = args.pages * 100
+    for lazy in (True, False):
+        for workers in (1, 8):
+            client = octokit.Client(
+                api_endpoint='%s/items?pages=%d' % (server.url, args.pages),
+                lazy=lazy, page_workers=workers)
+            label = 'paginate %d pages (%s, %d workers)' % (
+                args.pages, 'lazy' if lazy else 'eager', workers)
+            bench(label, lambda: client.paginate(auto_paginate=True), items,
+                  'item', repeat=1, memory=True)
+
+    client = octokit.Client(
+        api_endpoint='%s/items?pages=%d' % (server.url, args.pages))
+
+    def iterate():
+        for item in client.iter_paginate(prefetch=True):
+            item.number
+    bench('iter_paginate %d pages (prefetch)' % args.pages, iterate, items,
+          'item', repeat=1, memory=True)
+
+
+def bench_fanout(server, args):
+    client = octokit.Client(api_endpoint=server.url, pool_maxsize=16)
+    client.get()
+    logins = ['user%d' % n for n in range(args.users)]
+    for concurrency in (1, 8, 16):
+        bench('fetch_many %d users (%d threads)' % (args.users, concurrency),
+              lambda: client.fetch_many(client.user, logins,
+                                        concurrency=concurrency),
+              args.users, 'req', repeat=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--latency', type=float, default=0.005)
+    parser.add_argument('--pages', type=int, default=200)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+
+    server = MockGitHub(latency=args.latency).start()
+    print('mock API at %s, %.1f ms latency' % (server.url,
+                                                args.latency * 1e3))
+    try:
+        bench_resources(server, args)
+        bench_pagination(server, args)
+        bench_fanout(server, args)
+    finally:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
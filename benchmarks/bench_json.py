@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""
+Benchmark the decode throughput of every installed JSON backend.
+
+Decodes the response bodies recorded in tests/cassettes, and a page made of
+`--items` copies of them as a list endpoint would return.
+
+Usage: python -m benchmarks.bench_json [--items 100] [--number 200]
+"""
+
+import argparse
+import base64
+import glob
+import gzip
+import io
+import json
+import os
+import timeit
+
+from octokit.jsonlib import available_backends, get_backend
+
+CASSETTES = os.path.join(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))), 'tests', 'cassettes')
+
+
+def recorded_bodies():
+    """Yield the URI and JSON body of every response recorded in cassettes"""
+    for path in sorted(glob.glob(os.path.join(CASSETTES, '*.json'))):
+        with open(path) as f:
+            cassette = json.load(f)
+        for interaction in cassette['http_interactions']:
+            body = interaction['response']['body']
+            if body.get('base64_string'):
+                content = base64.b64decode(body['base64_string'])
+            else:
+                content = body.get('string', '').encode('utf-8')
+            if content[:2] == b'\x1f\x8b':
+                content = gzip.GzipFile(fileobj=io.BytesIO(content)).read()
+            if content:
+                yield interaction['request']['uri'], content
+
+
+def bench(label, loads, body, number):
+    seconds = min(timeit.repeat(lambda: loads(body), number=number, repeat=3))
+    per_call = seconds / number
+    print('%-30s %10.1f us %10.1f MB/s' % (
+        label, per_call * 1e6, len(body) / per_call / 1e6))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--items', type=int, default=100)
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+
+    bodies = list(recorded_bodies())
+    items = [json.loads(body.decode('utf-8')) for _, body in bodies]
+    page = json.dumps([items[n % len(items)]
+                       for n in range(args.items)]).encode('utf-8')
+    bodies.append(('page of %d items' % args.items, page))
+
+    backends = [get_backend(name) for name in available_backends()]
+    for label, body in bodies:
+        print('%s, %d bytes' % (label, len(body)))
+        for backend in backends:
+            bench('  ' + backend.name, backend.loads, body, args.number)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""
+Benchmark the memory held by a large list of resources.
+
+Builds a synthetic list of 50k items, as a paginated listing would return,
+and measures with tracemalloc the memory held by the decoded JSON alone, and
+once every item was wrapped into a Resource and accessed.
+
+Usage: python -m benchmarks.bench_memory [--items 50000]
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+
+from octokit import Resource
+
+
+def item(number):
+    return {
+        'id': number,
+        'number': number,
+        'title': 'Issue %d' % number,
+        'state': 'open',
+        'url': 'https://api.github.com/repos/o/r/issues/%d' % number,
+        'user': {'login': 'octocat', 'id': 1},
+    }
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--items', type=int, default=50000)
+    args = parser.parse_args()
+
+    body = json.dumps([item(n) for n in range(args.items)])
+    print('%d items, %d bytes of JSON' % (args.items, len(body)))
+
+    data, data_size, _ = measure(lambda: json.loads(body))
+    print('%-30s %8.1f MB %6d B/item' % (
+        'decoded JSON', data_size / 1e6, data_size / args.items))
+
+    for lazy in (False, True):
+        def build():
+            resource = Resource(None, name='Issues', data=json.loads(body),
+                                lazy=lazy)
+            for issue in resource.schema:
+                issue.number
+            return resource
+
+        _, size, peak = measure(build)
+        print('%-30s %8.1f MB %6d B/item (peak %.1f MB)' % (
+            'resources (%s)' % ('lazy' if lazy else 'eager'), size / 1e6,
+            (size - data_size) / args.items, peak / 1e6))
+
+
+if __name__ == '__main__':
+    main()
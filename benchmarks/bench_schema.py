@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+Benchmark the cost of turning a page of API results into a Resource.
+
+Compares eager and lazy schema parsing on a synthetic page of 100 issues,
+both for building the schema alone and for reading a few fields of every
+item, as a typical caller would.
+
+Usage: python -m benchmarks.bench_schema [--items 100] [--number 200]
+"""
+
+import argparse
+import json
+import timeit
+
+from octokit import Resource
+
+
+def issue(number):
+    user = {
+        'login': 'octocat',
+        'id': 1,
+        'avatar_url': 'https://github.com/images/error/octocat_happy.gif',
+        'url': 'https://api.github.com/users/octocat',
+        'html_url': 'https://github.com/octocat',
+        'followers_url': 'https://api.github.com/users/octocat/followers',
+        'repos_url': 'https://api.github.com/users/octocat/repos',
+        'type': 'User',
+        'site_admin': False,
+    }
+    base = 'https://api.github.com/repos/octocat/Hello-World/issues/%d' % number
+    return {
+        'id': number,
+        'number': number,
+        'url': base,
+        'labels_url': base + '/labels{/name}',
+        'comments_url': base + '/comments',
+        'events_url': base + '/events',
+        'html_url': 'https://github.com/octocat/Hello-World/issues/%d' % number,
+        'state': 'open',
+        'title': 'Found a bug',
+        'body': 'I\'m having a problem with this.' * 10,
+        'user': user,
+        'labels': [
+            {'url': base + '/labels/bug', 'name': 'bug', 'color': 'f29513'},
+            {'url': base + '/labels/ui', 'name': 'ui', 'color': 'c5def5'},
+        ],
+        'assignee': user,
+        'milestone': None,
+        'locked': False,
+        'comments': 0,
+        'pull_request': {
+            'url': base.replace('issues', 'pulls'),
+            'html_url': base,
+            'diff_url': base + '.diff',
+            'patch_url': base + '.patch',
+        },
+        'closed_at': None,
+        'created_at': '2011-04-22T13:33:48Z',
+        'updated_at': '2011-04-22T13:33:48Z',
+    }
+
+
+def parse(data, lazy):
+    return Resource(None, name='Issues', data=data, lazy=lazy)
+
+
+def parse_and_read(data, lazy):
+    resource = parse(data, lazy)
+    items = resource.schema if isinstance(data, list) else [resource]
+    for item in items:
+        item.number, item.title, item.state
+    return resource
+
+
+def bench(label, func, arg, number):
+    seconds = min(timeit.repeat(lambda: func(arg), number=number, repeat=3))
+    print('%-30s %10.1f us' % (label, seconds / number * 1e6))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--items', type=int, default=100)
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+
+    page = json.dumps([issue(n) for n in range(args.items)])
+    single = json.dumps(issue(1))
+    for label, body in (('page of %d issues' % args.items, page),
+                        ('single issue', single)):
+        print('%s, %d bytes' % (label, len(body)))
+        bench('  json.loads', json.loads, body, args.number)
+        data = json.loads(body)
+        for func in (parse, parse_and_read):
+            for lazy in (False, True):
+                bench('  %s (%s)' % (func.__name__,
+                                     'lazy' if lazy else 'eager'),
+                      lambda d: func(d, lazy), data, args.number)
+
+
+if __name__ == '__main__':
+    main()
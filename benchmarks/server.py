@@ -0,0 +1,153 @@
+"""
+A local mock of the GitHub API for the benchmarks.
+
+Serves the responses recorded in tests/cassettes, any user at /users/{user}
+(with the recorded user as body), and a synthetic paginated list at /items
+with Link headers, each after `latency` seconds.
+
+Usage: python -m benchmarks.server [--port 8000] [--latency 0.01]
+"""
+
+import argparse
+import json
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import parse_qsl, urlsplit
+except ImportError:  # Python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import parse_qsl, urlsplit
+
+from .bench_json import recorded_bodies
+
+RATE_LIMIT_HEADERS = {
+    'X-RateLimit-Limit': '5000',
+    'X-RateLimit-Remaining': '5000',
+    'X-RateLimit-Reset': str(2 ** 31 - 1),
+}
+
+
+def item(number):
+    return {
+        'id': number,
+        'number': number,
+        'title': 'Issue %d' % number,
+        'state': 'open',
+        'url': '/repos/o/r/issues/%d' % number,
+        'user': {'login': 'octocat', 'id': 1},
+        'labels': [{'name': 'bug', 'color': 'f29513'}],
+        'body': 'I\'m having a problem with this.' * 4,
+    }
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately, don't wait for an ACK between
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        split = urlsplit(self.path)
+        query = dict(parse_qsl(split.query))
+        headers = dict(RATE_LIMIT_HEADERS)
+        if split.path == '/items':
+            body = self.items_page(query, headers)
+        elif split.path in server.routes:
+            body = server.routes[split.path]
+        elif split.path.startswith('/users/'):
+            body = server.user
+        else:
+            return self.respond(404, b'{"message": "Not Found"}', headers)
+        self.respond(200, body, headers)
+
+    do_HEAD = do_GET
+
+    def items_page(self, query, headers):
+        server = self.server
+        page = int(query.get('page', 1))
+        per_page = int(query.get('per_page', 30))
+        pages = int(query.get('pages', server.pages))
+        base = '%s/items?pages=%d&per_page=%d' % (server.url, pages, per_page)
+        links = []
+        if page < pages:
+            links.append('<%s&page=%d>; rel="next"' % (base, page + 1))
+            links.append('<%s&page=%d>; rel="last"' % (base, pages))
+        if links:
+            headers['Link'] = ', '.join(links)
+        start = (page - 1) * per_page
+        return json.dumps([item(n) for n in range(start, start + per_page)]
+                          ).encode('utf-8')
+
+    def respond(self, status, body, headers):
+        self.send_response(status)
+        headers['Content-Type'] = 'application/json; charset=utf-8'
+        headers['Content-Length'] = str(len(body))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MockGitHub(ThreadingMixIn, HTTPServer):
+    """The mock API, listening on localhost at `url` once started.
+
+    `latency` is the delay of every response, in seconds, and `pages` the
+    default number of pages of /items.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0.0, pages=100):
+        HTTPServer.__init__(self, ('127.0.0.1', port), Handler)
+        self.latency = latency
+        self.pages = pages
+        self.url = 'http://127.0.0.1:%d' % self.server_address[1]
+
+        # Links of the recorded bodies point to the mock
+        self.routes = {}
+        for uri, body in recorded_bodies():
+            body = body.replace(b'https://api.github.com',
+                                self.url.encode('utf-8'))
+            self.routes[urlsplit(uri).path] = body
+        self.user = self.routes['/users/api-padawan']
+
+    def start(self):
+        """Serve requests in a background thread"""
+        thread = threading.Thread(target=self.serve_forever)
+        thread.daemon = True
+        thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.01)
+    parser.add_argument('--pages', type=int, default=100)
+    args = parser.parse_args()
+
+    server = MockGitHub(args.port, args.latency, args.pages)
+    print('Serving the mock GitHub API at %s' % server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,8 @@
+from .cache import FileCache, MemoryCache
 from .client import Client
+from .credentials import CredentialPool
+from .export import NDJSONSink
+from .metrics import MetricsAggregator
 from .resources import Resource
+from .retry import RetryPolicy
+from .throttle import Throttle
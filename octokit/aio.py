@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.aio
+~~~~~~~~~~~
+
+This module contains the asyncio flavor of the Client, sending requests with
+aiohttp (pip install octokit[async], Python 3.6+).
+"""
+
+import asyncio
+
+import aiohttp
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .client import BaseClient
+from .naming import names
+from .pagination import Pagination
+from .ratelimit import RateLimit
+from .resources import Resource
+from .streaming import JSONArrayDecoder
+
+
+class AsyncResource(Resource):
+    """A Resource whose HTTP methods are coroutines.
+
+    Its schema can't be loaded implicitly on attribute access: await one of
+    its HTTP methods, e.g. `await resource.get()`, to fetch it.
+    """
+
+    __slots__ = ()
+
+    def ensure_schema_loaded(self):
+        if self.loaded:
+            return
+
+        variables = self.variables()
+        if variables:
+            raise Exception("You need to call this resource with variables %s"
+                            % repr(list(variables)))
+
+        raise Exception("You need to await this resource's get() first")
+
+    def child(self, **kwargs):
+        return AsyncResource(self.session, lazy=self.lazy, client=self.client,
+                             **kwargs)
+
+    async def stream(self, *args, **kwargs):
+        """Make a HTTP GET request to the endpoint of resource, and yield the
+        items of the JSON array it returns as they are received.
+
+        Takes the same arguments as Resource.stream.
+        """
+        chunk_size = kwargs.pop('chunk_size', 64 * 1024)
+        prepared_req = self.prepare_request('GET', *args, **kwargs)
+        name = names.singularize(names.humanize(self._name))
+
+        decoder = JSONArrayDecoder()
+        async for chunk in self.client.iter_content(prepared_req, chunk_size):
+            for item in decoder.feed(chunk):
+                yield self.parse_schema_item(item, name)
+            if decoder.done:
+                break
+        decoder.close()
+
+    async def fetch_resource(self, method, *args, **kwargs):
+        raw = kwargs.pop('raw', False)
+        prepared_req = self.prepare_request(method, *args, **kwargs)
+        response = await self.client.send(prepared_req)
+        return self.build_result(response, raw)
+
+
+class AsyncClient(Pagination, RateLimit, BaseClient, AsyncResource):
+    """The asyncio counterpart of octokit.Client.
+
+    Requests are prepared by the requests `session` (auth, headers, ...) and
+    sent with aiohttp, at most `limit` at a time. Responses go through the same
+    callbacks and schema parsing as with Client.
+
+    Example usage:
+
+    >>> async with AsyncClient(auth=('mastahyeti', 'oauth-token')) as client:
+    ...     user = await client.user('mastahyeti')
+    >>> user.login
+    'mastahyeti'
+    """
+
+    def __init__(self, session=None, limit=100, **kwargs):
+        self.limit = limit
+        self.http = None
+        self._semaphore = None
+        super(AsyncClient, self).__init__(session=session, **kwargs)
+
+    async def __aenter__(self):
+        await self.load()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def load(self):
+        """Fetch the links of the API root, so that they can be followed"""
+        self.schema = (await self.get()).schema
+        self.loaded = True
+        return self
+
+    async def close(self):
+        """Close the connections of the client"""
+        if self.http is not None:
+            await self.http.close()
+            self.http = None
+
+    async def send(self, request, **kwargs):
+        """Send a prepared request on behalf of a resource of this client"""
+        async with self._open():
+            async with self._request(request) as r:
+                content = await r.read()
+
+        response = self.build_response(r, request, content)
+        self.response_callback(response)
+        return response
+
+    async def iter_content(self, request, chunk_size=64 * 1024):
+        """Send a prepared request, and yield the chunks of its body as they
+        are received
+        """
+        async with self._open():
+            async with self._request(request) as r:
+                # Error bodies are read whole, to be raised by the callbacks
+                content = await r.read() if r.status >= 400 else b''
+                self.response_callback(
+                    self.build_response(r, request, content))
+                async for chunk in r.content.iter_chunked(chunk_size):
+                    yield chunk
+
+    def _open(self):
+        if self.http is None:
+            self.http = aiohttp.ClientSession()
+            self._semaphore = asyncio.Semaphore(self.limit)
+        return self._semaphore
+
+    def _request(self, request):
+        return self.http.request(request.method, request.url,
+                                 headers=dict(request.headers),
+                                 data=request.body)
+
+    def build_response(self, r, request, content):
+        """Return the aiohttp response `r` as a requests.Response"""
+        response = requests.Response()
+        response.status_code = r.status
+        response.reason = r.reason
+        response.headers = CaseInsensitiveDict(r.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = str(r.url)
+        response.request = request
+        response._content = content
+        return response
+
+    @property
+    def rate_limit(self):
+        # Updated by every response, see update_rate_limit to request it
+        return self._rate_limit
+
+    async def update_rate_limit(self):
+        if not self.last_response:
+            await self.head()
+
+        self.record_rate_limit(self.last_response.headers)
+
+    async def paginate(self, *args, **kwargs):
+        auto_paginate = kwargs.pop('auto_paginate', self.auto_paginate)
+        raw = kwargs.pop('raw', False)
+        if raw:
+            pages = [page async for page in self.iter_pages(
+                *args, raw=raw, auto_paginate=auto_paginate, **kwargs)]
+            if raw == 'bytes':
+                return pages
+            return [item for page in pages for item in page]
+
+        self.pagination_params(kwargs, auto_paginate)
+        resource = await self.get(*args, **kwargs)
+        data = list(self.page_data(resource))
+
+        if auto_paginate:
+            urls = self.page_urls(resource)
+            remaining = self._rate_limit.remaining
+            if remaining is not None:
+                urls = urls[:remaining]
+            if urls:
+                pages = await asyncio.gather(*[
+                    resource.child(url=url, name=resource._name).get()
+                    for url in urls
+                ])
+                for resource in pages:
+                    data.extend(self.page_data(resource))
+
+            while 'next' in resource.rels and self.has_budget():
+                resource = await resource.rels['next'].get()
+                data.extend(self.page_data(resource))
+
+        if self.lazy:
+            return resource.child(data=data, url=resource.url,
+                                  name=resource._name)
+        return resource.child(schema=data, url=resource.url,
+                              name=resource._name)
+
+    async def iter_pages(self, *args, **kwargs):
+        """Yield the decoded JSON of every page as it arrives, or its body as
+        is with `raw='bytes'`, without building resources.
+
+        With `prefetch=True`, the next page is fetched while the current one
+        is consumed.
+        """
+        raw = kwargs.pop('raw', True)
+        prefetch = kwargs.pop('prefetch', False)
+        auto_paginate = kwargs.pop('auto_paginate', True)
+        self.pagination_params(kwargs, auto_paginate)
+        response = await self.send(self.prepare_request('GET', *args,
+                                                        **kwargs))
+
+        while True:
+            next_link = response.links.get('next')
+            has_next = (auto_paginate and next_link is not None and
+                        self.has_budget())
+            if has_next:
+                request = self.session.prepare_request(
+                    requests.Request('GET', next_link['url']))
+                if prefetch:
+                    next_page = asyncio.ensure_future(self.send(request))
+
+            yield self.build_result(response, raw)
+
+            if not has_next:
+                break
+            elif prefetch:
+                response = await next_page
+            else:
+                response = await self.send(request)
+
+    async def export(self, sink, *args, **kwargs):
+        """Write the items of every page to `sink` as they arrive, and return
+        the number of items written.
+
+        Takes the same arguments as iter_pages.
+        """
+        kwargs['raw'] = True
+        count = 0
+        async for page in self.iter_pages(*args, **kwargs):
+            sink.write(page)
+            count += len(page)
+        return count
+
+    async def iter_paginate(self, *args, **kwargs):
+        """Yield the items of every page, one page at a time.
+
+        With `prefetch=True`, the next page is fetched while the items of the
+        current one are consumed.
+        """
+        prefetch = kwargs.pop('prefetch', False)
+        self.pagination_params(kwargs, True)
+        resource = await self.get(*args, **kwargs)
+
+        while True:
+            has_next = 'next' in resource.rels and self.has_budget()
+            if has_next and prefetch:
+                next_page = asyncio.ensure_future(resource.rels['next'].get())
+
+            for item in resource.schema:
+                yield item
+
+            if not has_next:
+                break
+            elif prefetch:
+                resource = await next_page
+            else:
+                resource = await resource.rels['next'].get()
@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.cache
+~~~~~~~~~~~~~
+
+This module contains the HTTP cache, which revalidates GET requests with
+their ETag or Last-Modified date. GitHub does not count 304 (Not Modified)
+responses against the rate limit.
+
+It also contains the negative cache, which remembers for a while the GET
+requests that found nothing.
+"""
+
+from collections import OrderedDict
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+from .exceptions import NotFound
+from .jsonlib import default_backend
+
+
+# Headers describing the body, restored on the 304 responses answering a
+# revalidation (e.g. the Link header pagination follows)
+STORED_HEADERS = ('Link', 'Content-Type')
+
+
+class CacheEntry(object):
+    """The validators, body and body headers of a cached response."""
+
+    __slots__ = ('etag', 'last_modified', 'body', 'headers')
+
+    def __init__(self, etag=None, last_modified=None, body=b'',
+                 headers=None):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.headers = headers or {}
+
+    def __repr__(self):
+        return '<CacheEntry etag=%s last_modified=%s (%d bytes)>' % (
+            self.etag, self.last_modified, len(self.body))
+
+
+class BaseCache(object):
+    """Storage of cache entries, keyed by request.
+
+    The counters tell how effective the cache is: `misses` are requests with
+    nothing cached, `hits` are requests revalidated with a cached entry and
+    `not_modified` are the hits the API answered with a 304.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.not_modified = 0
+        self.misses = 0
+        self._counters_lock = threading.Lock()
+
+    def count(self, counter):
+        """Increment one of the counters"""
+        with self._counters_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, key):
+        """Return the entry stored for `key`, or None"""
+        raise NotImplementedError
+
+    def set(self, key, entry):
+        """Store `entry` for `key`"""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Remove the entry stored for `key`, if any"""
+        raise NotImplementedError
+
+    def clear(self):
+        """Remove every entry"""
+        raise NotImplementedError
+
+    def info(self):
+        """Return the cache statistics as a dictionary"""
+        return {'hits': self.hits, 'not_modified': self.not_modified,
+                'misses': self.misses}
+
+
+class MemoryCache(BaseCache):
+    """A least recently used cache holding at most `max_bytes` of bodies."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        super(MemoryCache, self).__init__()
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._entries[key] = entry
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._remove(key)
+            if len(entry.body) > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self.size += len(entry.body)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted.body)
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def info(self):
+        info = super(MemoryCache, self).info()
+        info.update(entries=len(self._entries), size=self.size,
+                    max_bytes=self.max_bytes)
+        return info
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry.body)
+
+
+class FileCache(BaseCache):
+    """A cache storing one file per entry in `directory`, so that it survives
+    process restarts.
+
+    Entry headers are encoded with the JSON `backend`, by default the one of
+    the client the cache is given to.
+    """
+
+    def __init__(self, directory, backend=None):
+        super(FileCache, self).__init__()
+        self.directory = directory
+        self.backend = backend
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as f:
+                header = (self.backend or default_backend).loads(
+                    f.readline())
+                body = f.read()
+        except (IOError, OSError, ValueError):
+            return None
+        return CacheEntry(header.get('etag'), header.get('last_modified'),
+                          body, header.get('headers'))
+
+    def set(self, key, entry):
+        header = (self.backend or default_backend).dumps({
+            'etag': entry.etag, 'last_modified': entry.last_modified,
+            'headers': entry.headers})
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header.encode('utf-8') + b'\n')
+            f.write(entry.body)
+        _replace(tmp, self._path(key))
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        for name in os.listdir(self.directory):
+            if name.endswith('.cache'):
+                os.remove(os.path.join(self.directory, name))
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.cache')
+
+
+def _replace(src, dst):
+    try:
+        os.replace(src, dst)
+    except AttributeError:  # Python 2
+        os.rename(src, dst)
+
+
+def cache_key(request):
+    """Return the key of a prepared request: its URL, credentials and
+    accepted media type. Credentials are hashed, never stored.
+    """
+    parts = [request.url,
+             request.headers.get('Authorization', ''),
+             request.headers.get('Accept', '')]
+    return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+class HTTPCache(object):
+    """Client mixin revalidating GET requests against a cache.
+
+    Pass `cache=MemoryCache()` or `cache=FileCache(path)` to the client to
+    enable it. When the API answers 304, the response is given the cached
+    body, so the returned resource is the same as on the first request.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.cache = kwargs.pop('cache', None)
+        super(HTTPCache, self).__init__(*args, **kwargs)
+        if isinstance(self.cache, FileCache) and self.cache.backend is None:
+            self.cache.backend = self.json_backend
+
+    def send(self, request, **kwargs):
+        cache = self.cache
+        # A streamed body is read by the caller, it can't be stored
+        if (cache is None or request.method != 'GET' or
+                kwargs.get('stream')):
+            return super(HTTPCache, self).send(request, **kwargs)
+
+        key = cache_key(request)
+        entry = cache.get(key)
+        if entry is None:
+            cache.count('misses')
+        else:
+            cache.count('hits')
+            if entry.etag:
+                request.headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                request.headers['If-Modified-Since'] = entry.last_modified
+
+        response = super(HTTPCache, self).send(request, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            cache.count('not_modified')
+            response._content = entry.body
+            for name, value in entry.headers.items():
+                if name not in response.headers:
+                    response.headers[name] = value
+        elif response.status_code == 200:
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                headers = dict((name, response.headers[name])
+                               for name in STORED_HEADERS
+                               if name in response.headers)
+                cache.set(key, CacheEntry(etag, last_modified,
+                                          response.content, headers))
+        return response
+
+
+class NegativeCache(object):
+    """Remembers, for `ttl` seconds, the GET requests answered with a 404 or
+    an empty list or object, so that they aren't sent again meanwhile.
+
+    At most `maxsize` requests are remembered; `hits` counts the requests
+    that weren't sent.
+    """
+
+    def __init__(self, ttl=60, maxsize=10000, clock=time.time):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.clock = clock
+        self.hits = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the response remembered for `key`, None for a 404, or raise
+        KeyError when nothing is remembered
+        """
+        with self._lock:
+            expires_at, response = self._entries[key]
+            if expires_at <= self.clock():
+                del self._entries[key]
+                raise KeyError(key)
+            self.hits += 1
+            return response
+
+    def set(self, key, response):
+        """Remember the empty `response` for `key`, or a 404 if None"""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (self.clock() + self.ttl, response)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def info(self):
+        """Return the cache statistics as a dictionary"""
+        return {'hits': self.hits, 'entries': len(self._entries),
+                'ttl': self.ttl}
+
+
+def is_empty(response):
+    """Return whether `response` is a success holding an empty list/object"""
+    return (response.status_code == 200 and
+            response.content.strip() in (b'[]', b'{}'))
+
+
+class NegativeCaching(object):
+    """Client mixin skipping the GET requests that found nothing recently.
+
+    Pass `negative_ttl=seconds` to the client to enable it. Meanwhile, the
+    same request raises NotFound again, or returns the same empty response.
+    """
+
+    def __init__(self, *args, **kwargs):
+        ttl = kwargs.pop('negative_ttl', None)
+        self.negative_cache = NegativeCache(ttl) if ttl else None
+        super(NegativeCaching, self).__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        negative_cache = self.negative_cache
+        if (negative_cache is None or request.method != 'GET' or
+                kwargs.get('stream')):
+            return super(NegativeCaching, self).send(request, **kwargs)
+
+        key = cache_key(request)
+        try:
+            response = negative_cache.get(key)
+        except KeyError:
+            pass
+        else:
+            if response is None:
+                raise NotFound()
+            return response
+
+        try:
+            response = super(NegativeCaching, self).send(request, **kwargs)
+        except NotFound:
+            negative_cache.set(key, None)
+            raise
+        if is_empty(response):
+            negative_cache.set(key, response)
+        return response
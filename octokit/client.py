@@ -9,10 +9,20 @@ This module contains the main Client class for octokit.py
 
 import requests
 
+from .cache import HTTPCache, NegativeCaching
+from .credentials import CredentialRouting
 from .exceptions import handle_status
+from .fanout import FanOut
+from .graphql import GraphQL
+from .jsonlib import get_backend
+from .metrics import Instrumentation
 from .pagination import Pagination
 from .ratelimit import RateLimit
 from .resources import Resource
+from .retry import Retrying
+from .singleflight import Coalescing
+from .throttle import Throttling
+from .watch import Watching
 
 
 class BaseClient(Resource):
@@ -22,6 +32,50 @@ class BaseClient(Resource):
     Requests.Session() object. After instantiation, the session may be modified
     by accessing the `session` attribute.
 
+    By default the schemas of the returned resources are built lazily, as
+    their attributes are accessed. Pass `lazy=False` to build them eagerly.
+    Pass `keep_responses=False` for resources to only keep the status and
+    headers of their response, rather than the whole requests.Response.
+
+    Each client has its own session unless one is given. Its connection pool
+    keeps connections to `pool_connections` hosts, with at most `pool_maxsize`
+    connections per host (raise it to the number of threads sharing the
+    client); when `pool_block` is set, requests wait for a free connection
+    instead of opening extra ones. Pass `keep_alive=False` to close the
+    connection after each request.
+
+    Responses are decoded with the fastest JSON library installed (orjson,
+    then ujson, then json); pass `json_backend='json'` to choose one.
+
+    Pass `cache=octokit.MemoryCache()` (or `octokit.FileCache(path)`) to
+    revalidate GET requests with their ETag instead of downloading them again.
+    Pass `negative_ttl=seconds` to not repeat, for that long, GET requests
+    that found nothing (404 or an empty list or object).
+
+    Pass `throttle=True` (or an `octokit.Throttle`) to pace requests over the
+    rate limit window and wait out rate limits instead of failing.
+
+    Pass `retry=True` (or an `octokit.RetryPolicy`) to retry requests failing
+    with a server error or a network error, with exponential backoff.
+
+    Pass `instruments=[callback]` for each callback to receive the timings,
+    bytes and status of every request (see `octokit.MetricsAggregator`).
+
+    Pass `credentials=[token, ...]` (or an `octokit.CredentialPool`) to send
+    each request with the token having the most remaining rate limit.
+
+    Pass `coalesce=True` for concurrent identical GET requests, e.g. threads
+    loading the same lazy resource, to share a single request and Resource.
+
+    Use `watch` to poll a resource for changes with conditional requests, or
+    `poller` to watch many resources on a single schedule.
+
+    A client may be shared by threads: `last_response` is the last response
+    of the calling thread, the rate limit is replaced atomically by each
+    response, and counters are updated under locks. Pass `auto_paginate` to
+    `paginate` rather than toggling the attribute of a shared client, and
+    raise `pool_maxsize` to the number of threads.
+
     Example usage:
 
     >>> client = octokit.Client(auth = ('mastahyeti', 'oauth-token'))
@@ -30,12 +84,35 @@ class BaseClient(Resource):
     'mastahyeti'
     """
 
-    def __init__(self, session=requests.Session(),
-                 api_endpoint='https://api.github.com', **kwargs):
+    # Callbacks receiving the metrics of each request, see Instrumentation
+    instruments = ()
+    # Coalescing of concurrent identical GET requests, see Coalescing
+    single_flight = None
+
+    def __init__(self, session=None, api_endpoint='https://api.github.com',
+                 lazy=True, keep_responses=True, pool_connections=10,
+                 pool_maxsize=10, pool_block=False, keep_alive=True,
+                 json_backend=None, **kwargs):
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                pool_block=pool_block)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        if not keep_alive:
+            session.headers['Connection'] = 'close'
+
         self.session = session
         self.url = api_endpoint
         self.schema = {}
+        self.loaded = False
         self._name = 'Client'
+        self._template = None
+        self.lazy = lazy
+        self.keep_responses = keep_responses
+        self.json_backend = get_backend(json_backend)
+        self.client = self
         self.auto_paginate = False
 
         self.session.hooks = dict(response=self.response_callback)
@@ -48,10 +125,22 @@ class BaseClient(Resource):
         except AttributeError:
             handle_status(404)
 
+    def send(self, request, **kwargs):
+        """Send a prepared request on behalf of a resource of this client"""
+        return self.session.send(request, **kwargs)
+
     def response_callback(self, r, *args, **kwargs):
-        data = r.json() if r.text != "" else {}
-        handle_status(r.status_code, data)
+        # Successful bodies are decoded once, by the Resource built from them
+        if r.status_code >= 400:
+            try:
+                data = self.json_backend.loads(r.content) if r.content else {}
+            except ValueError:
+                # e.g. the HTML page of a proxy in front of the API
+                data = {'message': r.reason}
+            handle_status(r.status_code, data, r)
 
 
-class Client(Pagination, RateLimit, BaseClient):
+class Client(Coalescing, Instrumentation, Watching, GraphQL, FanOut,
+             CredentialRouting, NegativeCaching, HTTPCache, Retrying,
+             Throttling, Pagination, RateLimit, BaseClient):
     pass
@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.credentials
+~~~~~~~~~~~~~~~~~~~
+
+This module contains the pool of credentials a client spreads its requests
+over, so that it isn't limited to the rate limit of a single token.
+"""
+
+import base64
+import re
+import threading
+import time
+
+from .exceptions import NotFound, TooManyRequests, Unauthorized
+from .lru import LRUCache
+from .ratelimit import _RateLimit
+from .throttle import retry_delay
+
+
+class Credential(object):
+    """A token, or a (username, password) tuple, with its own rate limit.
+
+    The `requests` counter tells how many requests were sent with it.
+    """
+
+    __slots__ = ('name', 'authorization', 'rate_limit', 'requests')
+
+    def __init__(self, auth, name=None):
+        if isinstance(auth, tuple):
+            userpass = ('%s:%s' % auth).encode('utf-8')
+            self.authorization = 'Basic ' + base64.b64encode(
+                userpass).decode('ascii')
+            name = name or auth[0]
+        else:
+            self.authorization = 'token %s' % auth
+        self.name = name or '#%d' % id(self)
+        self.rate_limit = _RateLimit()
+        self.requests = 0
+
+    def __repr__(self):
+        return '<Credential %s remaining=%s>' % (self.name,
+                                                 self.rate_limit.remaining)
+
+    def budget(self, now):
+        """Return how many requests may still be sent, infinite if unknown"""
+        rate_limit = self.rate_limit
+        if rate_limit.remaining is None:
+            return float('inf')
+        if rate_limit.resets_at <= now:
+            return rate_limit.limit
+        return rate_limit.remaining
+
+
+def owner_affinity(request):
+    """Return the owner of the repository or organization a request is about,
+    e.g. to keep the requests about an owner on its app installation token
+    """
+    match = re.search(r'/(?:repos|orgs|users)/([^/?#]+)', request.url)
+    return match.group(1).lower() if match else None
+
+
+class CredentialPool(object):
+    """Credentials sharing the requests of a client.
+
+    Each request is sent with the credential with the most remaining budget,
+    as last reported by the API. Given an `affinity` function returning a
+    key for a request (see owner_affinity), requests with the same key stick
+    to the same credential while it has a budget. The last `max_affinities`
+    keys are remembered.
+
+    With `strict_affinity`, e.g. for app installations that can only see
+    their own repositories, requests with the same key always go to the
+    same credential: the one `owners` maps the key to (by credential, name
+    or token), or else the first one the API answered successfully for that
+    key, trying the credentials in turn while it answers NotFound.
+    """
+
+    def __init__(self, credentials, affinity=None, strict_affinity=False,
+                 clock=time.time, owners=None, max_affinities=10000):
+        self.credentials = [c if isinstance(c, Credential) else Credential(c)
+                            for c in credentials]
+        if not self.credentials:
+            raise ValueError('A credential pool needs credentials')
+        self.affinity = affinity
+        self.strict_affinity = strict_affinity
+        self.clock = clock
+        self._by_authorization = dict((c.authorization, c)
+                                      for c in self.credentials)
+        self.owners = dict((key, self._find(credential))
+                           for key, credential in (owners or {}).items())
+        self._affinities = LRUCache(maxsize=max_affinities)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.credentials)
+
+    def _find(self, credential):
+        """Return the credential of the pool given as is, by name or token"""
+        if credential in self.credentials:
+            return credential
+        for c in self.credentials:
+            if c.name == credential:
+                return c
+        if not isinstance(credential, Credential):
+            found = self._by_authorization.get(
+                Credential(credential).authorization)
+            if found is not None:
+                return found
+        raise ValueError('Unknown credential %r' % (credential,))
+
+    def _owner(self, key):
+        """Return the credential `key` sticks to, if any"""
+        if key is None:
+            return None
+        credential = self.owners.get(key)
+        if credential is None:
+            credential = self._affinities.peek(key)
+        return credential
+
+    def choose(self, request, exclude=()):
+        """Return the credential to send `request` with, among those not in
+        `exclude`, or None if there is none left
+        """
+        key = self.affinity(request) if self.affinity is not None else None
+        with self._lock:
+            now = self.clock()
+            credential = self._owner(key)
+            if credential is not None and credential not in exclude:
+                if self.strict_affinity or credential.budget(now) > 0:
+                    credential.requests += 1
+                    return credential
+            elif credential is not None and self.strict_affinity:
+                return None
+
+            candidates = [c for c in self.credentials if c not in exclude]
+            if not candidates:
+                return None
+            credential = max(candidates, key=lambda c: c.budget(now))
+            # Under strict affinity, a key sticks to a credential once the
+            # API answered it, see record
+            if key is not None and not self.strict_affinity:
+                self._affinities.set(key, credential)
+            credential.requests += 1
+            return credential
+
+    def discovering(self, request):
+        """Whether `request` is about a key of strict affinity whose
+        credential isn't known yet, so that another one may be tried
+        """
+        if not self.strict_affinity or self.affinity is None:
+            return False
+        key = self.affinity(request)
+        return key is not None and self._owner(key) is None
+
+    def record(self, response):
+        """Update the rate limit of the credential the request of `response`
+        was sent with, and under strict affinity, stick the request's key to
+        it if the response is successful
+        """
+        request = response.request
+        credential = self._by_authorization.get(
+            request.headers.get('Authorization'))
+        if credential is None:
+            return
+        if (self.strict_affinity and self.affinity is not None and
+                response.status_code < 400):
+            key = self.affinity(request)
+            if key is not None and key not in self.owners:
+                self._affinities.set(key, credential)
+
+        rate_limit = _RateLimit.from_headers(response.headers)
+        if rate_limit is None:
+            return
+        with self._lock:
+            if rate_limit.supersedes(credential.rate_limit):
+                credential.rate_limit = rate_limit
+
+    def rate_limit(self):
+        """Return the combined rate limit of the credentials, counting those
+        not used yet as having a full budget
+        """
+        with self._lock:
+            now = self.clock()
+            known = [c.rate_limit for c in self.credentials
+                     if c.rate_limit.remaining is not None]
+            if not known:
+                return _RateLimit()
+            unknown = len(self.credentials) - len(known)
+            full = max(r.limit for r in known)
+            return _RateLimit(
+                sum(r.limit for r in known) + unknown * full,
+                sum(r.limit if r.resets_at <= now else r.remaining
+                    for r in known) + unknown * full,
+                max(r.resets_at for r in known))
+
+    def info(self):
+        """Return the requests and remaining budget of each credential"""
+        with self._lock:
+            return dict((c.name, {'requests': c.requests,
+                                  'remaining': c.rate_limit.remaining})
+                        for c in self.credentials)
+
+
+class CredentialRouting(object):
+    """Client mixin sending each request with a credential of a pool.
+
+    Pass `credentials=[token, ...]`, or a configured `CredentialPool`, to the
+    client to enable it. A request rejected because its credential's rate
+    limit is exhausted is sent again with another credential, and the
+    client's `rate_limit` is the combined budget of the pool. Under strict
+    affinity, a request answered NotFound is sent again with another
+    credential until its key sticks to one.
+    """
+
+    def __init__(self, *args, **kwargs):
+        credentials = kwargs.pop('credentials', None)
+        if credentials is not None and not isinstance(credentials,
+                                                      CredentialPool):
+            credentials = CredentialPool(credentials)
+        self.credentials = credentials
+        super(CredentialRouting, self).__init__(*args, **kwargs)
+
+    def response_callback(self, r, **kwargs):
+        if self.credentials is not None:
+            self.credentials.record(r)
+        return super(CredentialRouting, self).response_callback(r, **kwargs)
+
+    def record_rate_limit(self, headers):
+        if self.credentials is None:
+            return super(CredentialRouting, self).record_rate_limit(headers)
+        self._rate_limit = self.credentials.rate_limit()
+
+    def send(self, request, **kwargs):
+        pool = self.credentials
+        if pool is None:
+            return super(CredentialRouting, self).send(request, **kwargs)
+
+        tried = []
+        error = None
+        while True:
+            credential = pool.choose(request, exclude=tried)
+            if credential is None:
+                raise error
+            # Each attempt starts from the original headers, since inner
+            # layers (e.g. the cache) add headers of their own
+            attempt = request.copy()
+            attempt.headers['Authorization'] = credential.authorization
+            try:
+                return super(CredentialRouting, self).send(attempt, **kwargs)
+            except (Unauthorized, TooManyRequests) as e:
+                if retry_delay(e, credential.rate_limit, pool.clock) is None:
+                    raise
+                tried.append(credential)
+                error = e
+            except NotFound as e:
+                # Under strict affinity, another credential may see it
+                if not pool.discovering(request):
+                    raise
+                tried.append(credential)
+                error = e
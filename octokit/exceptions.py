@@ -11,6 +11,9 @@ This module contains octokit.py exceptions.
 class Error(Exception):
     """Something went wrong."""
 
+    # The response that caused the error, when raised by a client
+    response = None
+
     def __init__(self, data={'message': 'Something went wrong.'}):
         self.message = data['message']
 
@@ -57,6 +60,10 @@ class UnprocessableEntity(ClientError):
     """Status 422: Unprocessable entity."""
 
 
+class TooManyRequests(ClientError):
+    """Status 429: Too many requests."""
+
+
 class ServerError(Error):
     """Status 5xx: Server error."""
 
@@ -77,6 +84,15 @@ class ServiceUnavailable(ServerError):
     """Status 503: Service unavailable."""
 
 
+class GraphQLError(Error):
+    """The GraphQL API reported errors; they are all in `errors`."""
+
+    def __init__(self, errors, response=None):
+        super(GraphQLError, self).__init__(errors[0])
+        self.errors = errors
+        self.response = response
+
+
 # Mapping of status code to Exception
 STATUS_ERRORS = {
   400: BadRequest,
@@ -88,6 +104,7 @@ STATUS_ERRORS = {
   409: Conflict,
   415: UnsupportedMediaType,
   422: UnprocessableEntity,
+  429: TooManyRequests,
   499: ClientError,
   500: InternalServerError,
   501: NotImplemented,
@@ -97,7 +114,7 @@ STATUS_ERRORS = {
 }
 
 
-def handle_status(status, data=None):
+def handle_status(status, data=None, response=None):
     """Raise the appropriate error given a status code."""
     if status >= 400:
         error = STATUS_ERRORS.get(status)
@@ -109,4 +126,5 @@ def handle_status(status, data=None):
             else:
                 error = Error
         errorException = error(data) if data else error()
+        errorException.response = response
         raise errorException
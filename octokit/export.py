@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.export
+~~~~~~~~~~~~~~
+
+This module contains the sinks that paginated results can be exported to,
+see Pagination.export.
+"""
+
+from .jsonlib import default_backend
+
+
+class NDJSONSink(object):
+    """Writes items as newline-delimited JSON, one item per line, to `file`:
+    a path or a binary file object.
+
+    The `pages` and `items` counters tell how much was written.
+
+    >>> with NDJSONSink('issues.ndjson') as sink:
+    ...     client.export(sink, per_page=100)
+    """
+
+    def __init__(self, file, backend=default_backend):
+        if hasattr(file, 'write'):
+            self.file = file
+            self._owned = False
+        else:
+            self.file = open(file, 'wb')
+            self._owned = True
+        self.backend = backend
+        self.pages = 0
+        self.items = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, items):
+        """Write a page of decoded items"""
+        dumps = self.backend.dumps
+        lines = ''.join(dumps(item) + '\n' for item in items)
+        self.file.write(lines.encode('utf-8'))
+        self.pages += 1
+        self.items += len(items)
+
+    def close(self):
+        """Flush the file, and close it if it was opened by the sink"""
+        if self._owned:
+            self.file.close()
+        else:
+            self.file.flush()
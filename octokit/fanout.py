@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.fanout
+~~~~~~~~~~~~~~
+
+This module contains the bulk API fetching many resources in parallel.
+"""
+
+from multiprocessing.pool import ThreadPool
+
+
+class FanOut(object):
+    """Client mixin fetching many expansions of a resource concurrently."""
+
+    def fetch_many(self, resource, arguments, concurrency=8, method='GET',
+                   ordered=True):
+        """Fetch `resource` once per item of `arguments`, `concurrency`
+        requests at a time, over the connection pool of the client's session.
+
+        Each item holds the arguments of one call: a dict of keyword
+        arguments, a tuple of positional arguments, or a single value for
+        templates taking one variable, e.g.
+
+        >>> client.fetch_many(client.user, ['octocat', 'mastahyeti'])
+
+        Failures don't interrupt the others: the exception raised for an item
+        (e.g. by handle_status) is returned in place of its resource. Requests
+        go through the client's send, so the throttle, retry policy and cache
+        apply.
+
+        Returns the list of results in the order of `arguments`, or if
+        `ordered` is false, an iterator of (index, result) tuples in the order
+        they complete.
+        """
+        def fetch(indexed):
+            index, item = indexed
+            if isinstance(item, dict):
+                args, kwargs = (), dict(item)
+            elif isinstance(item, tuple):
+                args, kwargs = item, {}
+            else:
+                args, kwargs = (item,), {}
+
+            try:
+                return index, resource.fetch_resource(method, *args, **kwargs)
+            except Exception as e:
+                return index, e
+
+        items = list(enumerate(arguments))
+        if ordered:
+            if not items:
+                return []
+            pool = ThreadPool(min(concurrency, len(items)))
+            try:
+                return [result for _, result in pool.map(fetch, items)]
+            finally:
+                pool.terminate()
+        return self._fetch_unordered(fetch, items, concurrency)
+
+    def _fetch_unordered(self, fetch, items, concurrency):
+        if not items:
+            return
+        pool = ThreadPool(min(concurrency, len(items)))
+        try:
+            for result in pool.imap_unordered(fetch, items):
+                yield result
+        finally:
+            pool.terminate()
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.graphql
+~~~~~~~~~~~~~~~
+
+This module contains the GraphQL entry point, and the batcher collapsing many
+lookups into a single GraphQL query.
+"""
+
+import json
+
+from .exceptions import GraphQLError
+from .naming import names
+from .resources import Resource
+
+
+def graphql_endpoint(api_endpoint):
+    """Return the GraphQL endpoint of a REST API endpoint"""
+    api_endpoint = api_endpoint.rstrip('/')
+    if api_endpoint.endswith('/api/v3'):
+        # GitHub Enterprise
+        return api_endpoint[:-len('/v3')] + '/graphql'
+    return api_endpoint + '/graphql'
+
+
+def literal(value):
+    """Return `value` as a GraphQL literal"""
+    if isinstance(value, dict):
+        return '{%s}' % ', '.join('%s: %s' % (key, literal(value[key]))
+                                  for key in sorted(value))
+    if isinstance(value, (list, tuple)):
+        return '[%s]' % ', '.join(literal(item) for item in value)
+    return json.dumps(value)
+
+
+class GraphQLResource(Resource):
+    """A Resource of GraphQL data.
+
+    Unlike REST payloads, GraphQL data is deeply nested and holds no links to
+    follow, so every nested object and list is parsed into resources too.
+    """
+
+    __slots__ = ()
+
+    def ensure_schema_loaded(self):
+        if not self.loaded:
+            raise Exception("GraphQL resources can't be fetched")
+
+    def child(self, **kwargs):
+        return GraphQLResource(self.session, lazy=self.lazy,
+                               client=self.client, **kwargs)
+
+    def parse_schema_value(self, key, value):
+        if isinstance(value, dict):
+            return self.child(data=value, name=names.humanize(key))
+        elif isinstance(value, list):
+            return self.parse_schema_list(value, name=key)
+        return value
+
+    def parse_schema_item(self, data, name):
+        if isinstance(data, (dict, list)):
+            return self.child(data=data, name=name)
+        return self.child(schema=data, name=name)
+
+
+class GraphQL(object):
+    """Client mixin sending GraphQL queries."""
+
+    def graphql(self, query, variables=None):
+        """Run a GraphQL query and return its `data` as a Resource.
+
+        Raises GraphQLError when the API reports errors.
+        """
+        resource, payload = self.send_graphql(query, variables)
+        if payload.get('errors'):
+            raise GraphQLError(payload['errors'], resource.response)
+        return resource
+
+    def graphql_batch(self, size=50):
+        """Return a batch collapsing lookups into queries of `size` lookups"""
+        return GraphQLBatch(self, size)
+
+    def send_graphql(self, query, variables=None):
+        """Send a GraphQL query, return the Resource of its data and the
+        decoded payload
+        """
+        endpoint = GraphQLResource(self.session,
+                                   url=graphql_endpoint(self.url),
+                                   lazy=self.lazy, client=self)
+        body = {'query': query}
+        if variables:
+            body['variables'] = variables
+        prepared_req = endpoint.prepare_request('POST', json=body)
+        response = self.send(prepared_req)
+
+        payload = self.json_backend.loads(response.content)
+        resource = endpoint.child(response=response,
+                                  data=payload.get('data') or {},
+                                  name='GraphQL')
+        return resource, payload
+
+
+class GraphQLBatch(object):
+    """Lookups queued to be sent as aliased fields of a few GraphQL queries.
+
+    Example usage:
+
+    >>> batch = client.graphql_batch()
+    >>> for number in (1, 2):
+    ...     batch.add('repository', {'owner': 'octocat', 'name': 'hello'},
+    ...               'pullRequest(number: %d) { title state }' % number)
+    >>> [r.pullRequest.title for r in batch.execute()]
+    ['Fix the docs', 'Add a test']
+    """
+
+    def __init__(self, client, size=50):
+        self.client = client
+        self.size = size
+        self.lookups = []
+
+    def __len__(self):
+        return len(self.lookups)
+
+    def add(self, field, arguments=None, selection=''):
+        """Queue a lookup of `field(arguments) { selection }` and return its
+        index in the results of execute()
+        """
+        if arguments:
+            field = '%s(%s)' % (field, ', '.join(
+                '%s: %s' % (key, literal(arguments[key]))
+                for key in sorted(arguments)))
+        if selection:
+            field = '%s { %s }' % (field, selection)
+        self.lookups.append(field)
+        return len(self.lookups) - 1
+
+    def execute(self):
+        """Send the queued lookups and return their results, in the order they
+        were added. A lookup that failed gets its GraphQLError in place of its
+        Resource, as do all the lookups of a query that failed as a whole.
+
+        Lookups are dequeued as their query is answered: if sending a query
+        raises, its lookups and the following ones stay queued.
+        """
+        results = []
+        while self.lookups:
+            chunk = self.lookups[:self.size]
+            query = 'query { %s }' % ' '.join(
+                'l%d: %s' % (i, lookup) for i, lookup in enumerate(chunk))
+            resource, payload = self.client.send_graphql(query)
+            del self.lookups[:len(chunk)]
+
+            errors = {}
+            for error in payload.get('errors') or []:
+                path = error.get('path') or [None]
+                errors.setdefault(path[0], []).append(error)
+            if errors and not payload.get('data'):
+                failed = GraphQLError(payload['errors'], resource.response)
+                results.extend([failed] * len(chunk))
+                continue
+
+            for i in range(len(chunk)):
+                alias = 'l%d' % i
+                if alias in errors:
+                    results.append(GraphQLError(errors[alias],
+                                                resource.response))
+                else:
+                    results.append(resource.schema.get(alias))
+        return results
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.jsonlib
+~~~~~~~~~~~~~~~
+
+This module contains the JSON backends decoding the responses of the API.
+The fastest importable library is used unless the client is given another.
+"""
+
+import json
+
+
+class JSONBackend(object):
+    """A JSON library: `loads` decodes UTF-8 bytes or text, `dumps` encodes
+    into text.
+    """
+
+    __slots__ = ('name', 'loads', 'dumps')
+
+    def __init__(self, name, loads, dumps):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self):
+        return '<JSONBackend %s>' % self.name
+
+
+def _orjson():
+    import orjson
+    return JSONBackend('orjson', orjson.loads,
+                       lambda obj: orjson.dumps(obj).decode('utf-8'))
+
+
+def _ujson():
+    import ujson
+    return JSONBackend('ujson', ujson.loads, ujson.dumps)
+
+
+def _json():
+    def loads(s):
+        if isinstance(s, bytes):
+            s = s.decode('utf-8')
+        return json.loads(s)
+    return JSONBackend('json', loads, json.dumps)
+
+
+# In order of preference
+BACKENDS = (('orjson', _orjson), ('ujson', _ujson), ('json', _json))
+
+
+def available_backends():
+    """Return the names of the backends that can be imported"""
+    names = []
+    for name, load in BACKENDS:
+        try:
+            load()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_backend(backend=None):
+    """Return the JSONBackend called `backend`, or the fastest importable one.
+
+    Raises ImportError when the named backend isn't installed.
+    """
+    if isinstance(backend, JSONBackend):
+        return backend
+    for name, load in BACKENDS:
+        if backend is None:
+            try:
+                return load()
+            except ImportError:
+                continue
+        elif name == backend:
+            return load()
+    raise ValueError('Unknown JSON backend %r' % backend)
+
+
+default_backend = get_backend()
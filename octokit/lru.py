@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.lru
+~~~~~~~~~~~
+
+This module contains the bounded cache used to memoize derived values.
+"""
+
+from collections import OrderedDict
+import threading
+
+
+class LRUCache(object):
+    """A bounded, thread-safe, least recently used cache.
+
+    Values are computed outside of the lock, so two threads missing the same
+    key at once may both compute it; the last one wins. The `hits` and
+    `misses` counters tell how effective the cache is.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, key, create, *args):
+        """Return the value cached for `key`, calling `create(*args)` to
+        compute it on a miss.
+        """
+        with self._lock:
+            try:
+                value = self._values.pop(key)
+            except KeyError:
+                self.misses += 1
+            else:
+                self._values[key] = value
+                self.hits += 1
+                return value
+
+        value = create(*args)
+        self.set(key, value)
+        return value
+
+    def peek(self, key, default=None):
+        """Return the value cached for `key`, or `default` on a miss"""
+        with self._lock:
+            try:
+                value = self._values.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self._values[key] = value
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        """Cache `value` for `key`, evicting the least recently used values
+        beyond `maxsize`
+        """
+        with self._lock:
+            self._values.pop(key, None)
+            self._values[key] = value
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+
+    def info(self):
+        """Return the cache statistics as a dictionary"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'maxsize': self.maxsize, 'size': len(self._values)}
+
+    def clear(self):
+        """Empty the cache and reset its statistics"""
+        with self._lock:
+            self._values.clear()
+            self.hits = self.misses = 0
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.metrics
+~~~~~~~~~~~~~~~
+
+This module contains the instrumentation of the requests of a client, and an
+aggregator of their timings per endpoint.
+"""
+
+import bisect
+import threading
+import time
+
+from .templates import strip_query
+
+timer = getattr(time, 'perf_counter', time.time)
+
+
+class RequestMetrics(object):
+    """What a request cost, in seconds and bytes.
+
+    `endpoint` is the URI template the request was expanded from, without its
+    query, so that requests to the same endpoint are grouped together.
+    `ttfb` is the time until the response headers were parsed, `network` the
+    time spent sending the request and receiving the whole response, `decode`
+    and `parse` the times spent decoding the JSON and building the resource.
+    """
+
+    __slots__ = ('method', 'endpoint', 'status', 'bytes', 'ttfb', 'network',
+                 'decode', 'parse', 'total', 'rate_limit_remaining', 'error')
+
+    def __init__(self, method, endpoint):
+        self.method = method
+        self.endpoint = endpoint
+        self.status = None
+        self.bytes = 0
+        self.ttfb = None
+        self.network = None
+        self.decode = None
+        self.parse = None
+        self.total = None
+        self.rate_limit_remaining = None
+        self.error = None
+
+    def __repr__(self):
+        return '<RequestMetrics %s %s %s %.1fms>' % (
+            self.method, self.endpoint, self.status, (self.total or 0) * 1e3)
+
+    def record_response(self, response):
+        self.status = response.status_code
+        self.bytes = len(response.content or b'')
+        if response.elapsed is not None:
+            self.ttfb = response.elapsed.total_seconds()
+        remaining = response.headers.get('X-RateLimit-Remaining', '')
+        if remaining.isdigit():
+            self.rate_limit_remaining = int(remaining)
+
+
+def endpoint_key(resource):
+    """Return the URI template the requests of `resource` are expanded from,
+    without its query
+    """
+    return strip_query(resource._template or resource.url)
+
+
+class Instrumentation(object):
+    """Client mixin measuring each request of its resources.
+
+    Pass `instruments=[callback, ...]` to the client, or call
+    `add_instrument`, for each callback to receive the RequestMetrics of
+    every request. Without instruments, requests aren't measured at all.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.instruments = list(kwargs.pop('instruments', None) or ())
+        super(Instrumentation, self).__init__(*args, **kwargs)
+
+    def add_instrument(self, callback):
+        """Call `callback` with the RequestMetrics of every request"""
+        self.instruments = self.instruments + [callback]
+
+    def remove_instrument(self, callback):
+        """Stop calling `callback`"""
+        self.instruments = [c for c in self.instruments if c != callback]
+
+    def measure(self, resource, request, raw=False):
+        """Send `request` on behalf of `resource`, and return its response
+        along with the result of resource.build_result, reporting its
+        metrics to the instruments
+        """
+        metrics = RequestMetrics(request.method, endpoint_key(resource))
+        start = timer()
+        try:
+            response = self.send(request)
+        except Exception as e:
+            metrics.total = metrics.network = timer() - start
+            metrics.error = e
+            if getattr(e, 'response', None) is not None:
+                metrics.record_response(e.response)
+            self.report(metrics)
+            raise
+
+        metrics.network = timer() - start
+        metrics.record_response(response)
+        result = resource.build_result(response, raw, metrics)
+        metrics.total = timer() - start
+        self.report(metrics)
+        return response, result
+
+    def report(self, metrics):
+        for callback in self.instruments:
+            callback(metrics)
+
+
+class Histogram(object):
+    """Counts of durations in exponential buckets, from `base` seconds and
+    doubling `size` times.
+    """
+
+    __slots__ = ('bounds', 'counts', 'count', 'sum', 'max')
+
+    def __init__(self, base=0.0001, size=24):
+        self.bounds = [base * 2 ** i for i in range(size)]
+        self.counts = [0] * (size + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q):
+        """Return the upper bound of the bucket holding the `q` quantile"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self):
+        if not self.count:
+            return {'count': 0}
+        return {'count': self.count, 'mean': self.sum / self.count,
+                'p50': self.quantile(0.5), 'p90': self.quantile(0.9),
+                'p99': self.quantile(0.99), 'max': self.max}
+
+
+class MetricsAggregator(object):
+    """An instrument keeping histograms of the timings of the requests per
+    method and endpoint, with their statuses and bytes received.
+
+    At most `max_endpoints` endpoints are kept apart, the requests to other
+    endpoints are counted together under the OTHER endpoint.
+
+    >>> metrics = MetricsAggregator()
+    >>> client = octokit.Client(instruments=[metrics])
+    >>> metrics.summary()[('GET', 'https://api.github.com/users/{user}')]
+    """
+
+    TIMINGS = ('total', 'ttfb', 'network', 'decode', 'parse')
+    OTHER = '(other)'
+
+    def __init__(self, max_endpoints=1000):
+        self.max_endpoints = max_endpoints
+        self.endpoints = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, metrics):
+        key = (metrics.method, metrics.endpoint)
+        with self._lock:
+            stats = self.endpoints.get(key)
+            if stats is None and len(self.endpoints) >= self.max_endpoints:
+                key = (metrics.method, self.OTHER)
+                stats = self.endpoints.get(key)
+            if stats is None:
+                stats = self.endpoints[key] = {
+                    'histograms': dict((name, Histogram())
+                                       for name in self.TIMINGS),
+                    'statuses': {}, 'bytes': 0,
+                    'rate_limit_remaining': None}
+            for name in self.TIMINGS:
+                value = getattr(metrics, name)
+                if value is not None:
+                    stats['histograms'][name].add(value)
+            statuses = stats['statuses']
+            statuses[metrics.status] = statuses.get(metrics.status, 0) + 1
+            stats['bytes'] += metrics.bytes
+            if metrics.rate_limit_remaining is not None:
+                stats['rate_limit_remaining'] = metrics.rate_limit_remaining
+
+    def summary(self):
+        """Return the statistics of every (method, endpoint) as a dict"""
+        with self._lock:
+            return dict(
+                (key, {'timings': dict(
+                           (name, histogram.summary())
+                           for name, histogram in stats['histograms'].items()),
+                       'statuses': dict(stats['statuses']),
+                       'bytes': stats['bytes'],
+                       'rate_limit_remaining': stats['rate_limit_remaining']})
+                for key, stats in self.endpoints.items())
+
+    def clear(self):
+        with self._lock:
+            self.endpoints.clear()
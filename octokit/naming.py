@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.naming
+~~~~~~~~~~~~~~
+
+This module contains the cache of resource names derived from API keys.
+"""
+
+from inflection import humanize, singularize
+
+from .lru import LRUCache
+
+
+def _humanize_singular(name):
+    return humanize(singularize(name))
+
+
+class NameCache(LRUCache):
+    """A cache of the names given to resources.
+
+    The keys of the GitHub API are few and fixed, while inflecting them is
+    comparatively slow, so every name is only inflected the first time it is
+    seen.
+    """
+
+    def humanize(self, name):
+        """Return the humanized `name`, e.g. 'owner' -> 'Owner'"""
+        return self.get((name, False), humanize, name)
+
+    def singularize(self, name):
+        """Return the humanized singular of `name`, used for list items"""
+        return self.get((name, True), _humanize_singular, name)
+
+
+# The cache shared by all resources
+names = NameCache()
@@ -1,4 +1,14 @@
-from .resources import Resource
+from multiprocessing.pool import ThreadPool
+
+try:
+    from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+except ImportError:  # Python 2
+    from urllib import urlencode
+    from urlparse import parse_qsl, urlsplit, urlunsplit
+
+import requests
+
+from .resources import LazySchemaList
 
 
 class Pagination(object):
@@ -6,6 +16,9 @@ class Pagination(object):
         # TODO (howei): possibly extract auto_paginate from kwargs
         # so users can do client = Client(auto_paginate=True)
         self.auto_paginate = False
+        # Number of threads fetching the pages after the first one, when the
+        # API tells which page is the last
+        self.page_workers = kwargs.pop('page_workers', 1)
         super(Pagination, self).__init__(*args, **kwargs)
 
     def response_callback(self, r, **kwargs):
@@ -13,11 +26,129 @@ class Pagination(object):
         return super(Pagination, self).response_callback(r, **kwargs)
 
     def paginate(self, *args, **kwargs):
+        # auto_paginate may be given per call, e.g. by threads sharing the
+        # client
+        auto_paginate = kwargs.pop('auto_paginate', self.auto_paginate)
+        raw = kwargs.pop('raw', False)
+        if raw:
+            # Plain items (or bodies) without building any resource
+            pages = self.iter_pages(*args, raw=raw,
+                                    auto_paginate=auto_paginate, **kwargs)
+            if raw == 'bytes':
+                return list(pages)
+            return [item for page in pages for item in page]
+
+        self.pagination_params(kwargs, auto_paginate)
+        resource = self.get(*args, **kwargs)
+        data = list(self.page_data(resource))
+
+        if auto_paginate:
+            urls = self.page_urls(resource) if self.page_workers > 1 else []
+            if urls:
+                urls = urls[:self.rate_limit.remaining]
+                for resource in self.fetch_pages(resource, urls):
+                    data.extend(self.page_data(resource))
+
+            while 'next' in resource.rels and self.has_budget():
+                resource = resource.rels['next'].get()
+                data.extend(self.page_data(resource))
+
+        if self.lazy:
+            return resource.child(data=data, url=resource.url,
+                                  name=resource._name)
+        return resource.child(schema=data, url=resource.url,
+                              name=resource._name)
+
+    def iter_paginate(self, *args, **kwargs):
+        """Yield the items of every page, one page at a time, so that memory
+        use does not grow with the number of results.
+
+        With `prefetch=True`, the next page is fetched in the background while
+        the items of the current one are consumed.
+        """
+        prefetch = kwargs.pop('prefetch', False)
+        self.pagination_params(kwargs, True)
+        resource = self.get(*args, **kwargs)
+
+        pool = ThreadPool(1) if prefetch else None
+        try:
+            while True:
+                has_next = 'next' in resource.rels and self.has_budget()
+                if has_next and pool is not None:
+                    next_page = pool.apply_async(resource.rels['next'].get)
+
+                for item in resource.schema:
+                    yield item
+
+                if not has_next:
+                    break
+                elif pool is not None:
+                    resource = next_page.get()
+                else:
+                    resource = resource.rels['next'].get()
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    def iter_pages(self, *args, **kwargs):
+        """Yield the decoded JSON of every page as it arrives, or its body as
+        is with `raw='bytes'`, without building resources.
+
+        With `prefetch=True`, the next page is fetched in the background while
+        the current one is consumed.
+        """
+        raw = kwargs.pop('raw', True)
+        prefetch = kwargs.pop('prefetch', False)
+        auto_paginate = kwargs.pop('auto_paginate', True)
+        self.pagination_params(kwargs, auto_paginate)
+        request = self.prepare_request('GET', *args, **kwargs)
+
+        pool = ThreadPool(1) if prefetch else None
+        try:
+            response, page = self.exchange(request, raw)
+            while True:
+                next_link = response.links.get('next')
+                has_next = (auto_paginate and next_link is not None and
+                            self.has_budget())
+                if has_next:
+                    request = self.session.prepare_request(
+                        requests.Request('GET', next_link['url']))
+                    if pool is not None:
+                        next_page = pool.apply_async(self.exchange,
+                                                     (request, raw))
+
+                yield page
+
+                if not has_next:
+                    break
+                elif pool is not None:
+                    response, page = next_page.get()
+                else:
+                    response, page = self.exchange(request, raw)
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    def export(self, sink, *args, **kwargs):
+        """Write the items of every page to `sink` as they arrive (e.g. an
+        octokit.NDJSONSink), and return the number of items written.
+
+        Takes the same arguments as iter_pages.
+        """
+        kwargs['raw'] = True
+        count = 0
+        for page in self.iter_pages(*args, **kwargs):
+            sink.write(page)
+            count += len(page)
+        return count
+
+    def pagination_params(self, kwargs, default_per_page):
+        """Move the pagination arguments of `kwargs` into its query params"""
         params = {}
         if 'per_page' in kwargs:
             params['per_page'] = kwargs['per_page']
             del kwargs['per_page']
-        elif self.auto_paginate:
+        elif default_per_page:
             # if per page is not defined, default to 100 per page
             params['per_page'] = 100
 
@@ -26,13 +157,44 @@ class Pagination(object):
             del kwargs['page']
 
         kwargs['params'] = params
-        resource = self.get(*args, **kwargs)
-        data = list(resource.schema)
 
-        if self.auto_paginate:
-            while 'next' in resource.rels and self.rate_limit.remaining > 0:
-                resource = resource.rels['next'].get()
-                data.extend(list(resource.schema))
+    def page_data(self, resource):
+        """Return the items of a page, undecoded when the schema is lazy"""
+        if isinstance(resource.schema, LazySchemaList):
+            return resource.schema.data
+        return resource.schema
+
+    def page_urls(self, resource):
+        """Return the URLs of the pages following `resource`, or an empty list
+        if they can't be told from its `next` and `last` links
+        """
+        if 'next' not in resource.rels or 'last' not in resource.rels:
+            return []
+
+        scheme, netloc, path, query, fragment = urlsplit(
+            resource.rels['next'].url)
+        params = parse_qsl(query, keep_blank_values=True)
+        last = dict(parse_qsl(urlsplit(resource.rels['last'].url).query))
+        first = dict(params).get('page', '')
+        if not first.isdigit() or not last.get('page', '').isdigit():
+            return []
+
+        urls = []
+        for page in range(int(first), int(last['page']) + 1):
+            query = urlencode([(k, page if k == 'page' else v)
+                               for k, v in params])
+            urls.append(urlunsplit((scheme, netloc, path, query, fragment)))
+        return urls
+
+    def fetch_pages(self, resource, urls):
+        """Fetch the pages at `urls` concurrently and return them in order"""
+        def fetch(url):
+            return resource.child(url=url, name=resource._name).get()
 
-        return Resource(self.session, schema=data,
-                        url=resource.url, name=resource.name)
+        if not urls:
+            return []
+        pool = ThreadPool(min(self.page_workers, len(urls)))
+        try:
+            return pool.map(fetch, urls)
+        finally:
+            pool.terminate()
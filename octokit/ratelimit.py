@@ -1,42 +1,104 @@
 import calendar
+import threading
 import time
 
 
 class RateLimit(object):
     def __init__(self, *args, **kwargs):
         self._rate_limit = _RateLimit()
-        self.last_response = None
+        self._rate_limit_lock = threading.Lock()
+        self._local = threading.local()
         super(RateLimit, self).__init__(*args, **kwargs)
 
     def response_callback(self, r, **kwargs):
         self.last_response = r
+        self.record_rate_limit(r.headers)
         return super(RateLimit, self).response_callback(r, **kwargs)
 
+    @property
+    def last_response(self):
+        """The last response received by the current thread"""
+        return getattr(self._local, 'response', None)
+
+    @last_response.setter
+    def last_response(self, response):
+        self._local.response = response
+
     @property
     def rate_limit(self):
-        self.update_rate_limit()
+        # The rate limit is kept up to date by every response, only ask the
+        # API for it when nothing was requested yet
+        if self._rate_limit.remaining is None:
+            self.update_rate_limit()
         return self._rate_limit
 
     def update_rate_limit(self):
         if not self.last_response:
             self.head()
 
-        rate_limit = self._rate_limit
-        headers = self.last_response.headers
+        self.record_rate_limit(self.last_response.headers)
+
+    def has_budget(self):
+        """Whether requests may still be sent in the current window, as far
+        as the responses received so far tell
+        """
+        remaining = self._rate_limit.remaining
+        return remaining is None or remaining > 0
+
+    def record_rate_limit(self, headers):
+        """Update the rate limit from the headers of a response, if any.
+
+        The rate limit is replaced as a whole, so that readers never see half
+        of an update, and responses received out of order never raise the
+        remaining budget of the current window.
+        """
+        rate_limit = _RateLimit.from_headers(headers)
+        if rate_limit is None:
+            return
 
-        rate_limit.limit = int(headers['X-RateLimit-Limit'])
-        rate_limit.remaining = int(headers['X-RateLimit-Remaining'])
-        rate_limit.resets_at = int(headers['X-RateLimit-Reset'])
-        delta = rate_limit.resets_at - calendar.timegm(time.gmtime())
-        rate_limit.resets_in = max(delta, 0)
+        with self._rate_limit_lock:
+            if rate_limit.supersedes(self._rate_limit):
+                self._rate_limit = rate_limit
 
 
 class _RateLimit(object):
-    __slots__ = ('limit', 'remaining', 'resets_at', 'resets_in')
+    __slots__ = ('limit', 'remaining', 'resets_at')
+
+    def __init__(self, limit=None, remaining=None, resets_at=None):
+        self.limit = limit
+        self.remaining = remaining
+        self.resets_at = resets_at
 
     def __repr__(self):
         s = ', '.join(
             '{}={}'.format(slot, getattr(self, slot))
-            for slot in self.__slots__
+            for slot in self.__slots__ + ('resets_in',)
         )
         return '%s(%s)' % (self.__class__, s)
+
+    @property
+    def resets_in(self):
+        if self.resets_at is None:
+            return None
+        delta = self.resets_at - calendar.timegm(time.gmtime())
+        return max(delta, 0)
+
+    def supersedes(self, current):
+        """Return whether this rate limit is more recent than `current`"""
+        return (current.remaining is None or
+                self.resets_at > current.resets_at or
+                self.resets_at == current.resets_at and
+                self.remaining <= current.remaining)
+
+    @classmethod
+    def from_headers(cls, headers):
+        """Return the rate limit of the headers of a response, if any"""
+        if 'X-RateLimit-Remaining' not in headers:
+            return None
+        # Search and GraphQL requests have budgets of their own
+        if headers.get('X-RateLimit-Resource', 'core') != 'core':
+            return None
+
+        return cls(int(headers['X-RateLimit-Limit']),
+                   int(headers['X-RateLimit-Remaining']),
+                   int(headers['X-RateLimit-Reset']))
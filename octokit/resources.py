@@ -7,32 +7,103 @@ octokit.resources
 This module contains the workhorse of octokit.py, the Resources.
 """
 
-from inflection import humanize, singularize
+try:
+    from collections.abc import Mapping, Sequence
+except ImportError:  # Python 2
+    from collections import Mapping, Sequence
+
 import requests
-import uritemplate
+
+from .cache import cache_key
+from .jsonlib import default_backend
+from .metrics import timer
+from .naming import names
+from .streaming import iter_json_array
+from .templates import get_template, strip_query
+
+
+# The relations of resources without any, shared by all of them. Never mutated.
+NO_RELS = {}
+
+
+class ResponseSummary(object):
+    """What a resource keeps of its response when the client doesn't keep
+    responses: the status and headers, without the body.
+    """
+
+    __slots__ = ('status_code', 'reason', 'headers', 'url')
+
+    def __init__(self, response):
+        self.status_code = response.status_code
+        self.reason = response.reason
+        self.headers = response.headers
+        self.url = response.url
+
+    def __repr__(self):
+        return '<ResponseSummary [%s]>' % self.status_code
 
 
 class Resource(object):
     """The workhorse of octokit.py, this class makes the API calls and
     interprets them into an accessible schema. The API calls and schema parsing
     are lazy and only happen when an attribute of the resource is requested.
+
+    When `lazy` is set, the decoded JSON is kept as is and the child resources
+    of the schema are only built the first time they are accessed.
+
+    Requests are sent through `client` when given, so that the features of
+    the client (caching, ...) apply to every resource it returns. When the
+    client doesn't keep responses, `response` is only a ResponseSummary.
+
+    `template` is the URI template `url` was expanded from, when it is
+    already expanded, so that the requests to an endpoint can be told apart
+    from the values they were made with (see Instrumentation).
+
+    Resources have no instance dictionary, to stay small in large listings.
     """
 
+    __slots__ = ('session', '_name', 'url', 'schema', 'response', 'rels',
+                 'lazy', 'client', 'loaded', '_template')
+
     def __init__(self, session, name=None, url=None, schema=None,
-                 response=None):
+                 response=None, data=None, lazy=False, client=None,
+                 template=None):
         self.session = session
         self._name = name
         self.url = url
+        self._template = template
         self.schema = schema
         self.response = response
-        self.rels = {}
+        self.rels = NO_RELS
+        self.lazy = lazy
+        self.client = client
+        # Whether the schema is known, even if empty
+        self.loaded = schema is not None
 
         if response:
-            self.schema = self.parse_schema(response.json())
-            self.rels = self.parse_rels(response)
+            if data is None:
+                backend = (client.json_backend if client is not None
+                           else default_backend)
+                data = backend.loads(response.content)
+            if getattr(response, 'history', None):
+                # Redirected, the URL isn't the one the template expanded to
+                self._template = None
             self.url = response.url
-
-        if type(self.schema) == dict and 'url' in self.schema:
+            if response.links:
+                self.rels = self.parse_rels(response)
+            if client is not None and not client.keep_responses:
+                self.response = ResponseSummary(response)
+
+        if data is not None:
+            if (self._template is not None and isinstance(data, dict) and
+                    data.get('url') not in (None, strip_query(self.url))):
+                # e.g. /user returns the resource of /users/{user}
+                self._template = None
+            self.schema = self.parse_schema(data)
+            self.loaded = True
+            if isinstance(data, dict) and 'url' in data:
+                self.url = data['url']
+        elif isinstance(self.schema, dict) and 'url' in self.schema:
             self.url = self.schema['url']
 
     def __getattr__(self, name):
@@ -51,10 +122,9 @@ class Resource(object):
 
     def __repr__(self):
         self.ensure_schema_loaded()
-        schema_type = type(self.schema)
-        if schema_type == dict:
+        if isinstance(self.schema, Mapping):
             subtitle = ', '.join(self.schema.keys())
-        elif schema_type == list:
+        elif isinstance(self.schema, (list, LazySchemaList)):
             subtitle = str(len(self.schema))
         else:
             subtitle = str(self.schema)
@@ -63,7 +133,7 @@ class Resource(object):
 
     def variables(self):
         """Returns the variables the URI takes"""
-        return uritemplate.variables(self.url)
+        return get_template(self.url).variables
 
     def keys(self):
         """Returns the links this resource can follow"""
@@ -72,7 +142,7 @@ class Resource(object):
 
     def ensure_schema_loaded(self):
         """Check if resources' schema has been loaded, otherwise load it"""
-        if self.schema:
+        if self.loaded:
             return
 
         variables = self.variables()
@@ -81,15 +151,22 @@ class Resource(object):
                             % repr(list(variables)))
 
         self.schema = self.get().schema
+        self.loaded = True
 
     def parse_schema(self, response):
         """Parse the response and return its schema"""
         data_type = type(response)
 
         if data_type == dict:
-            schema = self.parse_schema_dict(response)
+            if self.lazy:
+                schema = LazySchemaDict(self, response)
+            else:
+                schema = self.parse_schema_dict(response)
         elif data_type == list:
-            schema = self.parse_schema_list(response, self._name)
+            if self.lazy:
+                schema = LazySchemaList(self, response, self._name)
+            else:
+                schema = self.parse_schema_list(response, self._name)
         else:
             # TODO (eduardo) -- handle request that don't return anything
             raise Exception("Unknown type of response from the API.")
@@ -101,38 +178,61 @@ class Resource(object):
         schema = {}
         for key in data:
             name = key.split('_url')[0]
-            if key.endswith('_url'):
-                if data[key]:
-                    schema[name] = Resource(self.session, url=data[key],
-                                            name=humanize(name))
-                else:
-                    schema[name] = data[key]
-            else:
-                data_type = type(data[key])
-                if data_type == dict:
-                    schema[name] = Resource(self.session, schema=data[key],
-                                            name=humanize(name))
-                elif data_type == list:
-                    schema[name] = self.parse_schema_list(data[key], name=name)
-                else:
-                    schema[name] = data[key]
+            schema[name] = self.parse_schema_value(key, data[key])
 
         return schema
 
+    def parse_schema_value(self, key, value):
+        """Convert a single key of the responses' JSON into a resource"""
+        name = key.split('_url')[0]
+        if key.endswith('_url'):
+            if value:
+                return self.child(url=value, name=names.humanize(name),
+                                  template=self.child_template(value))
+            return value
+
+        data_type = type(value)
+        if data_type == dict:
+            return self.child(schema=value, name=names.humanize(name))
+        elif data_type == list:
+            return self.parse_schema_list(value, name=name)
+        return value
+
     def parse_schema_list(self, data, name):
         """Convert the responses' JSON into a list of resources"""
-        return [
-          Resource(self.session, schema=s, name=humanize(singularize(name)))
-          for s in data
-        ]
+        name = names.singularize(name)
+        return [self.parse_schema_item(s, name) for s in data]
+
+    def parse_schema_item(self, data, name):
+        """Convert an item of the responses' JSON list into a resource"""
+        return self.child(schema=data, name=name)
 
     def parse_rels(self, response):
         """Parse relation links from the headers"""
         return {
-          link['rel']: Resource(self.session, url=link['url'], name=self._name)
+          # Links to other pages of the same endpoint, e.g. by repository id
+          link['rel']: self.child(url=link['url'], name=self._name,
+                                  template=self._template)
           for link in response.links.values()
         }
 
+    def child_template(self, url):
+        """Return the URI template of `url` if it is under the URL of this
+        resource and this resource's template is known, None otherwise
+        """
+        template = self._template
+        if template is None:
+            return None
+        base = strip_query(self.url)
+        if url.startswith(base) and url[len(base):len(base) + 1] in '/{?':
+            return strip_query(template) + url[len(base):]
+        return None
+
+    def child(self, **kwargs):
+        """Build a resource sharing this resource's session and options"""
+        return Resource(self.session, lazy=self.lazy, client=self.client,
+                        **kwargs)
+
     def head(self, *args, **kwargs):
         """Make a HTTP HEAD request to the endpoint of resource."""
         return self.fetch_resource('HEAD', *args, **kwargs)
@@ -161,24 +261,178 @@ class Resource(object):
         """Make a HTTP OPTIONS request to the endpoint of resource."""
         return self.fetch_resource('OPTIONS', *args, **kwargs)
 
+    def stream(self, *args, **kwargs):
+        """Make a HTTP GET request to the endpoint of resource, and yield the
+        items of the JSON array it returns as they are received, instead of
+        decoding the whole response first.
+
+        Takes the same arguments as fetch_resource, and the `chunk_size` in
+        bytes of the reads.
+        """
+        chunk_size = kwargs.pop('chunk_size', 64 * 1024)
+        prepared_req = self.prepare_request('GET', *args, **kwargs)
+        if self.client is not None:
+            response = self.client.send(prepared_req, stream=True)
+        else:
+            response = self.session.send(prepared_req, stream=True)
+
+        name = names.singularize(names.humanize(self._name))
+        try:
+            for item in iter_json_array(response.iter_content(chunk_size)):
+                yield self.parse_schema_item(item, name)
+        finally:
+            response.close()
+
     def fetch_resource(self, method, *args, **kwargs):
         """Fetch the endpoint from the API and return it as a Resource.
 
         method         - HTTP method.
         *args          - Uri template argument
         **kwargs       – Uri template arguments
+
+        Pass `raw=True` to get the decoded JSON instead of a Resource, or
+        `raw='bytes'` to get the body as is.
         """
-        variables = self.variables()
+        raw = kwargs.pop('raw', False)
+        prepared_req = self.prepare_request(method, *args, **kwargs)
+        return self.exchange(prepared_req, raw)[1]
+
+    def exchange(self, prepared_req, raw=False):
+        """Send a prepared request, and return its response along with the
+        Resource of the response (or its content, see `raw` in
+        fetch_resource).
+
+        Concurrent identical GET requests share a single exchange when the
+        client coalesces them.
+        """
+        client = self.client
+        if (prepared_req.method == 'GET' and client is not None and
+                client.single_flight is not None):
+            # Credentials may be added by the client when sending, so the
+            # requests of different clients are never shared
+            key = (id(client), cache_key(prepared_req), raw)
+            return client.single_flight.call(key, self.send_request,
+                                             prepared_req, raw)
+        return self.send_request(prepared_req, raw)
+
+    def send_request(self, prepared_req, raw=False):
+        """Send a prepared request, and return its response along with the
+        Resource of the response (or its content, see `raw` in
+        fetch_resource), measured when the client has instruments
+        """
+        client = self.client
+        if client is None:
+            response = self.session.send(prepared_req)
+        elif client.instruments:
+            return client.measure(self, prepared_req, raw)
+        else:
+            response = client.send(prepared_req)
+        return response, self.build_result(response, raw)
+
+    def build_result(self, response, raw=False, metrics=None):
+        """Return the Resource of `response`, or its content (see `raw` in
+        fetch_resource), recording the decode and parse times in `metrics`
+        if given
+        """
+        if raw == 'bytes':
+            return response.content
+        backend = (self.client.json_backend if self.client is not None
+                   else default_backend)
+        start = timer() if metrics is not None else None
+        data = backend.loads(response.content)
+        if metrics is not None:
+            decoded = timer()
+            metrics.decode = decoded - start
+        if raw:
+            return data
+
+        child = self.child(response=response, data=data,
+                           name=names.humanize(self._name),
+                           template=self._template or self.url)
+        if metrics is not None:
+            metrics.parse = timer() - decoded
+        return child
+
+    def prepare_request(self, method, *args, **kwargs):
+        """Expand the URI template and prepare the request to the endpoint.
+
+        Takes the same arguments as fetch_resource.
+        """
+        template = get_template(self.url)
+        variables = template.variables
         if len(args) == 1 and len(variables) == 1:
             kwargs[next(iter(variables))] = args[0]
 
         url_args = {k: kwargs[k] for k in kwargs if k in variables}
         req_args = {k: kwargs[k] for k in kwargs if k not in variables}
 
-        url = uritemplate.expand(self.url, url_args)
+        url = template.expand(url_args)
         request = requests.Request(method, url, **req_args)
-        prepared_req = self.session.prepare_request(request)
-        response = self.session.send(prepared_req)
+        return self.session.prepare_request(request)
+
+
+class LazySchemaDict(Mapping):
+    """Read-only schema of a JSON object whose values are converted into
+    resources the first time they are accessed.
+    """
+
+    __slots__ = ('resource', 'data', '_keys', '_cache')
+
+    def __init__(self, resource, data):
+        self.resource = resource
+        self.data = data
+        self._keys = dict((key.split('_url')[0], key) for key in data)
+        self._cache = {}
+
+    def __getitem__(self, name):
+        try:
+            return self._cache[name]
+        except KeyError:
+            key = self._keys[name]
+            value = self.resource.parse_schema_value(key, self.data[key])
+            self._cache[name] = value
+            return value
+
+    def __contains__(self, name):
+        return name in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+class LazySchemaList(Sequence):
+    """Read-only schema of a JSON array whose items are converted into
+    resources the first time they are accessed.
+    """
 
-        return Resource(self.session, response=response,
-                        name=humanize(self._name))
+    __slots__ = ('resource', 'data', 'name', '_item_name', '_cache')
+
+    def __init__(self, resource, data, name):
+        self.resource = resource
+        self.data = data
+        self.name = name
+        self._item_name = None
+        self._cache = [None] * len(data)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        item = self._cache[index]
+        if item is None:
+            if self._item_name is None:
+                self._item_name = names.singularize(self.name)
+            item = self.resource.parse_schema_item(self.data[index],
+                                                   self._item_name)
+            self._cache[index] = item
+        return item
+
+    def __iter__(self):
+        for index in range(len(self.data)):
+            yield self[index]
+
+    def __len__(self):
+        return len(self.data)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.retry
+~~~~~~~~~~~~~
+
+This module contains the policy retrying requests that failed because of a
+server error or a transient network error.
+"""
+
+import random
+import threading
+import time
+
+import requests
+
+from . import exceptions
+
+
+class RetryPolicy(object):
+    """When and how long to wait before retrying a failed request.
+
+    A request is sent at most `attempts` times. Between attempts, the policy
+    waits for the Retry-After of the response if any, otherwise for an
+    exponential backoff of `backoff * 2 ** retry` seconds, capped at
+    `max_backoff`, with full jitter. Only the idempotent `methods` are retried.
+
+    The `retries` and `failures` counters tell how many requests were retried
+    and how many still failed after the last attempt.
+    """
+
+    IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+    # Exceptions that may go away when the request is sent again: server
+    # errors (500, 502, 503, 504 and unknown ones) and network errors
+    RETRY_EXCEPTIONS = (exceptions.ServerError, requests.ConnectionError,
+                        requests.Timeout)
+    # Server errors that won't, e.g. 501 Not Implemented
+    PERMANENT_EXCEPTIONS = (exceptions.NotImplemented,)
+
+    def __init__(self, attempts=3, backoff=0.5, max_backoff=30,
+                 methods=IDEMPOTENT_METHODS, jitter=True, sleep=time.sleep):
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.methods = frozenset(methods)
+        self.jitter = jitter
+        self.sleep = sleep
+        self.retries = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def info(self):
+        """Return the retry statistics as a dictionary"""
+        return {'retries': self.retries, 'failures': self.failures}
+
+    def should_retry(self, method, error, attempt):
+        """Return whether the `attempt`-th request failing with `error` may be
+        sent again.
+        """
+        if method not in self.methods:
+            return False
+        if (not isinstance(error, self.RETRY_EXCEPTIONS) or
+                isinstance(error, self.PERMANENT_EXCEPTIONS)):
+            return False
+        if attempt >= self.attempts:
+            with self._lock:
+                self.failures += 1
+            return False
+        return True
+
+    def delay(self, error, attempt):
+        """Return how long to wait after the `attempt`-th request failed"""
+        response = getattr(error, 'response', None)
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return int(retry_after)
+
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def wait(self, error, attempt):
+        """Count the retry and wait before sending the request again"""
+        with self._lock:
+            self.retries += 1
+        self.sleep(self.delay(error, attempt))
+
+
+class Retrying(object):
+    """Client mixin retrying failed requests according to a RetryPolicy.
+
+    Pass `retry=True`, or a configured `RetryPolicy`, to the client to enable
+    it. Since every page is a request of its own, a paginated listing
+    resumes from the page that failed.
+    """
+
+    def __init__(self, *args, **kwargs):
+        retry = kwargs.pop('retry', None)
+        self.retry = RetryPolicy() if retry is True else retry
+        super(Retrying, self).__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        policy = self.retry
+        if policy is None:
+            return super(Retrying, self).send(request, **kwargs)
+
+        attempt = 1
+        while True:
+            try:
+                return super(Retrying, self).send(request, **kwargs)
+            except Exception as e:
+                if not policy.should_retry(request.method, e, attempt):
+                    raise
+                policy.wait(e, attempt)
+                attempt += 1
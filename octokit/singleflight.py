@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.singleflight
+~~~~~~~~~~~~~~~~~~~~
+
+This module contains the coalescing of identical GET requests sent
+concurrently, e.g. by threads loading the same lazy resource.
+"""
+
+import threading
+
+
+class _Flight(object):
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Runs at most one call per key at a time: callers arriving while the
+    call of their key is in flight wait for it, and share its result or
+    exception.
+
+    The `calls` and `coalesced` counters tell how many calls were made and
+    how many callers shared the call of another.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def call(self, key, func, *args):
+        """Return `func(*args)`, or the result of the call in flight for
+        `key`
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = func(*args)
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def info(self):
+        """Return the coalescing statistics as a dictionary"""
+        with self._lock:
+            return {'calls': self.calls, 'coalesced': self.coalesced,
+                    'in_flight': len(self._flights)}
+
+
+class Coalescing(object):
+    """Client mixin sharing one request between the identical GET requests
+    of its resources sent concurrently.
+
+    Pass `coalesce=True` to the client to enable it. Requests are identical
+    when their client, URL, credentials and accepted media type are; the
+    callers share the same Resource (or raw content).
+    """
+
+    def __init__(self, *args, **kwargs):
+        coalesce = kwargs.pop('coalesce', False)
+        self.single_flight = SingleFlight() if coalesce else None
+        super(Coalescing, self).__init__(*args, **kwargs)
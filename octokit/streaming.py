@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.streaming
+~~~~~~~~~~~~~~~~~
+
+This module contains the incremental decoder of JSON arrays, used to stream
+the items of large list responses as they are received.
+"""
+
+import codecs
+import json
+
+_decoder = json.JSONDecoder()
+_whitespace = ' \t\n\r'
+
+
+class JSONArrayDecoder(object):
+    """Decodes a JSON array from its UTF-8 encoded text, fed one chunk at a
+    time, into its elements.
+
+    `done` tells whether the closing bracket was received.
+    """
+
+    def __init__(self):
+        self.done = False
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buf = ''
+        self._pos = 0
+        self._started = False
+        self._separated = True  # Whether the next element may start here
+
+    def feed(self, chunk):
+        """Return the list of the elements completed by `chunk`"""
+        if self.done:
+            return []
+        if isinstance(chunk, bytes):
+            chunk = self._text.decode(chunk)
+        # What was decoded is only dropped here, so that the buffer is copied
+        # once per chunk rather than once per element
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return list(self._elements())
+
+    def close(self):
+        """Raise ValueError if the array wasn't received whole"""
+        if not self.done:
+            raise ValueError('Invalid or truncated JSON array')
+
+    def _elements(self):
+        buf = self._buf
+        pos = self._pos
+        try:
+            while True:
+                # Skip whitespace and separators until the next element
+                while pos < len(buf) and buf[pos] in _whitespace:
+                    pos += 1
+                if pos == len(buf):
+                    return
+
+                char = buf[pos]
+                if not self._started:
+                    if char != '[':
+                        raise ValueError('Expected a JSON array')
+                    self._started = True
+                    pos += 1
+                    continue
+                if char == ']':
+                    self.done = True
+                    return
+                if char == ',' and not self._separated:
+                    self._separated = True
+                    pos += 1
+                    continue
+                if not self._separated:
+                    raise ValueError('Invalid JSON array')
+
+                try:
+                    element, end = _decoder.raw_decode(buf, pos)
+                except ValueError:
+                    return  # Incomplete, wait for the next chunk
+                # A number may continue in the next chunk: the element is
+                # complete once what follows it was received
+                if end == len(buf) or buf[end] not in _whitespace + ',]':
+                    return
+                yield element
+                pos = end
+                self._separated = False
+        finally:
+            self._pos = pos
+
+
+def iter_json_array(chunks):
+    """Yield the elements of the JSON array whose UTF-8 encoded text is split
+    into the `chunks` iterable, as soon as each of them is received.
+    """
+    decoder = JSONArrayDecoder()
+    for chunk in chunks:
+        for element in decoder.feed(chunk):
+            yield element
+        if decoder.done:
+            return
+    decoder.close()
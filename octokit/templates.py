@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.templates
+~~~~~~~~~~~~~~~~~
+
+This module contains the cache of parsed URI templates.
+"""
+
+import re
+
+from uritemplate import URITemplate
+
+from .lru import LRUCache
+
+
+class Template(object):
+    """A URI template parsed once, along with the variables it takes."""
+
+    __slots__ = ('template', 'variables', '_template')
+
+    def __init__(self, template):
+        self.template = template
+        self._template = URITemplate(template)
+        self.variables = frozenset(self._template.variable_names)
+
+    def __repr__(self):
+        return '<Template %s>' % self.template
+
+    def expand(self, values):
+        """Expand the template with the `values` dictionary"""
+        return self._template.expand(values)
+
+
+# The templates shared by all resources, keyed by template string
+templates = LRUCache(maxsize=512)
+
+# The query expressions of a template, e.g. {?since,per_page}
+QUERY_EXPRESSIONS = re.compile(r'\{[?&][^}]*\}')
+
+
+def get_template(template):
+    """Return the parsed `template`, parsing it on first use"""
+    return templates.get(template, Template, template)
+
+
+def strip_query(template):
+    """Return the URI template or URL `template` without its query"""
+    return QUERY_EXPRESSIONS.sub('', template).split('?', 1)[0]
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.throttle
+~~~~~~~~~~~~~~~~
+
+This module contains the scheduler pacing requests so that they stay within
+the rate limit, instead of failing once it is exhausted.
+"""
+
+import threading
+import time
+
+from .exceptions import TooManyRequests, Unauthorized
+
+
+class Throttle(object):
+    """A token bucket spreading the remaining rate limit over its window.
+
+    Tokens are refilled at `remaining / resets_in` per second, as reported by
+    the last response, and up to `burst` requests may be sent back to back.
+    When the budget is exhausted, or the API asked to back off, requests
+    block until they may be sent.
+    """
+
+    def __init__(self, burst=10, clock=time.time, sleep=time.sleep):
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = float(burst)
+        self.paused_until = 0
+        self.waited = 0.0
+        self._updated_at = None
+        self._lock = threading.Lock()
+
+    def acquire(self, rate_limit):
+        """Block until a request may be sent within `rate_limit`"""
+        with self._lock:
+            now = self.clock()
+            wait = max(self.paused_until - now, 0)
+
+            if rate_limit.remaining is not None:
+                if rate_limit.remaining <= 0:
+                    wait = max(wait, rate_limit.resets_at - now)
+                else:
+                    # The reset time has a one second resolution
+                    window = max(rate_limit.resets_at - now, 1)
+                    rate = rate_limit.remaining / float(window)
+                    if self._updated_at is not None:
+                        elapsed = max(now - self._updated_at, 0)
+                        self.tokens = min(self.burst,
+                                          self.tokens + elapsed * rate)
+                    self._updated_at = now
+                    # Reserve a token, waiting for it when in debt, so that
+                    # concurrent callers are spaced out
+                    self.tokens -= 1
+                    if self.tokens < 0:
+                        wait = max(wait, -self.tokens / rate)
+
+            self.waited += wait
+
+        if wait > 0:
+            self.sleep(wait)
+
+    def pause(self, seconds):
+        """Hold every request for `seconds`"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, self.clock() + seconds)
+
+
+def retry_delay(error, rate_limit, clock=time.time):
+    """Return how long to wait before retrying a request rejected by a rate
+    limit, or None if `error` isn't caused by one.
+    """
+    response = error.response
+    if response is None:
+        return None
+
+    retry_after = response.headers.get('Retry-After')
+    if retry_after is not None and retry_after.isdigit():
+        return int(retry_after)
+    if response.headers.get('X-RateLimit-Remaining') == '0':
+        if rate_limit.remaining:
+            # Other credentials of the client still have a budget
+            return None
+        return max(rate_limit.resets_at - clock(), 1)
+    if 'rate limit' in str(error.message).lower():
+        # Secondary rate limits without a Retry-After: wait a minute
+        return 60
+    return None
+
+
+class Throttling(object):
+    """Client mixin pacing requests with a Throttle.
+
+    Pass `throttle=True`, or a configured `Throttle`, to the client to enable
+    it. Requests rejected by a (secondary) rate limit are retried once the
+    API allows it, up to `throttle_retries` times.
+    """
+
+    def __init__(self, *args, **kwargs):
+        throttle = kwargs.pop('throttle', None)
+        self.throttle = Throttle() if throttle is True else throttle
+        self.throttle_retries = kwargs.pop('throttle_retries', 3)
+        super(Throttling, self).__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        throttle = self.throttle
+        if throttle is None:
+            return super(Throttling, self).send(request, **kwargs)
+
+        retries = 0
+        while True:
+            throttle.acquire(self._rate_limit)
+            try:
+                return super(Throttling, self).send(request, **kwargs)
+            except (Unauthorized, TooManyRequests) as e:
+                delay = retry_delay(e, self._rate_limit, throttle.clock)
+                if delay is None or retries >= self.throttle_retries:
+                    raise
+                retries += 1
+                throttle.pause(delay)
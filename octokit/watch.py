@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+
+"""
+octokit.watch
+~~~~~~~~~~~~~
+
+This module contains the poller watching resources for changes with
+conditional requests. GitHub does not count 304 (Not Modified) responses
+against the rate limit, and tells how often to poll with X-Poll-Interval.
+"""
+
+import hashlib
+import heapq
+import itertools
+from multiprocessing.pool import ThreadPool
+import threading
+import time
+
+from .naming import names
+
+
+def item_key(item, backend):
+    """Return what identifies an item of a watched list between polls"""
+    if isinstance(item, dict):
+        for key in ('id', 'node_id', 'sha', 'url'):
+            if key in item:
+                return item[key]
+    return backend.dumps(item)
+
+
+class Watch(object):
+    """A resource watched by a Poller, expanded with the given arguments.
+
+    It is polled every `interval` seconds, or every X-Poll-Interval seconds
+    if the API asks for more. The `polls` and `changes` counters tell how
+    many requests were sent and how many found a change.
+    """
+
+    __slots__ = ('resource', 'args', 'kwargs', 'interval', 'poll_interval',
+                 'initial', 'etag', 'last_modified', 'digest', 'seen',
+                 'next_at', 'active', 'polls', 'changes')
+
+    def __init__(self, resource, args=(), kwargs=None, interval=60,
+                 initial=True):
+        self.resource = resource
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.interval = interval
+        self.poll_interval = None
+        self.initial = initial
+        self.etag = None
+        self.last_modified = None
+        self.digest = None
+        # Keys of the items of the last list, None until it was polled
+        self.seen = None
+        self.next_at = None
+        self.active = True
+        self.polls = 0
+        self.changes = 0
+
+    def __repr__(self):
+        return '<Watch %s every %ss>' % (self.resource.url, self.delay)
+
+    @property
+    def delay(self):
+        """How long to wait between two polls"""
+        return max(self.interval, self.poll_interval or 0)
+
+    def poll(self, client):
+        """Send the conditional request, and return the changes since the
+        last poll as a Resource, or None
+        """
+        kwargs = dict(self.kwargs)
+        headers = dict(kwargs.pop('headers', None) or {})
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+
+        resource = self.resource
+        request = resource.prepare_request('GET', *self.args,
+                                           headers=headers, **kwargs)
+        response = client.send(request)
+        self.polls += 1
+
+        poll_interval = response.headers.get('X-Poll-Interval', '')
+        if poll_interval.isdigit():
+            self.poll_interval = int(poll_interval)
+        # A 304 may have been given its body by the client's HTTP cache
+        if response.status_code == 304 and (self.digest is not None or
+                                            not response.content):
+            return None
+        self.etag = response.headers.get('ETag')
+        self.last_modified = response.headers.get('Last-Modified')
+
+        # Without validators every poll downloads the body, compare it
+        digest = hashlib.sha1(response.content).digest()
+        if digest == self.digest:
+            return None
+        self.digest = digest
+
+        backend = client.json_backend
+        data = backend.loads(response.content)
+        first = self.seen is None
+        if isinstance(data, list):
+            seen = self.seen or frozenset()
+            self.seen = frozenset(item_key(item, backend) for item in data)
+            data = [item for item in data
+                    if item_key(item, backend) not in seen]
+            if not data:
+                return None
+        else:
+            self.seen = frozenset()
+        if first and not self.initial:
+            return None
+
+        self.changes += 1
+        return resource.child(response=response, data=data,
+                              name=names.humanize(resource._name),
+                              template=resource._template or resource.url)
+
+
+class Poller(object):
+    """Polls many watched resources from a single schedule.
+
+    Watches are kept in a heap ordered by when they are due, so that each
+    step only looks at the watches to poll. Due watches are polled
+    `concurrency` at a time, through the client's send.
+
+    Iterating over the poller blocks until a watch changes and yields
+    (watch, result) tuples, where result is a Resource of what changed: the
+    new items of a list, or the whole resource otherwise. Failures don't
+    stop the poller: the exception raised by a poll is yielded as result,
+    and the watch is polled again after its interval.
+    """
+
+    def __init__(self, client, concurrency=8, clock=time.time,
+                 sleep=time.sleep):
+        self.client = client
+        self.concurrency = concurrency
+        self.clock = clock
+        self.sleep = sleep
+        self._heap = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return sum(1 for _, _, watch in self._heap if watch.active)
+
+    def __iter__(self):
+        while True:
+            for event in self.poll_due():
+                yield event
+
+            with self._lock:
+                while self._heap and not self._heap[0][2].active:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    return
+                next_at = self._heap[0][0]
+            wait = next_at - self.clock()
+            if wait > 0:
+                self.sleep(wait)
+
+    def watch(self, resource, *args, **kwargs):
+        """Watch `resource` expanded with the given arguments, and return the
+        Watch. It is first polled right away.
+
+        interval - Seconds between polls, 60 by default.
+        initial  - Whether the first poll yields the current content; if
+                   false, only what changes afterwards is yielded.
+        """
+        interval = kwargs.pop('interval', 60)
+        initial = kwargs.pop('initial', True)
+        watch = Watch(resource, args, kwargs, interval, initial)
+        self._schedule(watch, self.clock())
+        return watch
+
+    def unwatch(self, watch):
+        """Stop polling `watch`"""
+        watch.active = False
+
+    def poll_due(self):
+        """Poll the watches that are due, and return the list of (watch,
+        result) tuples of those that changed or failed
+        """
+        now = self.clock()
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, _, watch = heapq.heappop(self._heap)
+                if watch.active:
+                    due.append(watch)
+        if not due:
+            return []
+
+        if self.concurrency > 1 and len(due) > 1:
+            pool = ThreadPool(min(self.concurrency, len(due)))
+            try:
+                results = pool.map(self._poll, due)
+            finally:
+                pool.terminate()
+        else:
+            results = [self._poll(watch) for watch in due]
+
+        events = []
+        for watch, result in zip(due, results):
+            if watch.active:
+                self._schedule(watch, self.clock() + watch.delay)
+            if result is not None:
+                events.append((watch, result))
+        return events
+
+    def _poll(self, watch):
+        try:
+            return watch.poll(self.client)
+        except Exception as e:
+            return e
+
+    def _schedule(self, watch, at):
+        watch.next_at = at
+        with self._lock:
+            heapq.heappush(self._heap, (at, next(self._counter), watch))
+
+
+class Watching(object):
+    """Client mixin polling resources for changes."""
+
+    def poller(self, concurrency=8):
+        """Return a Poller of this client, to watch many resources"""
+        return Poller(self, concurrency)
+
+    def watch(self, resource, *args, **kwargs):
+        """Poll `resource` expanded with the given arguments, and yield a
+        Resource of what changed each time it changes: the new items of a
+        list, or the whole resource otherwise.
+
+        Takes the same `interval` and `initial` options as Poller.watch.
+        Failures are raised.
+
+        >>> for events in client.watch(client.events, interval=60):
+        ...     print([event.type for event in events])
+        """
+        poller = Poller(self, concurrency=1)
+        poller.watch(resource, *args, **kwargs)
+        for _, result in poller:
+            if isinstance(result, Exception):
+                raise result
+            yield result
@@ -11,7 +11,7 @@ emails = ''
 package = []
 requires = [
   "requests <= 2.7.0",
-  "uritemplate >= 0.5",
+  "uritemplate >= 3.0",
   "inflection >= 0.3.1",
   "requests-mock >= 0.6.0",
   "nose >= 1.3.7",
@@ -28,5 +28,6 @@ setup(
   url='https://github.com/octokit/octokit.py',
   packages=package,
   install_requires=requires,
+  extras_require={'async': ['aiohttp >= 3.0'], 'fast': ['orjson']},
   license='MIT',
 )
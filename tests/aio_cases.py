@@ -0,0 +1,146 @@
+"""
+The tests of octokit/aio.py, imported by test_aio on the Python versions
+supporting them.
+"""
+
+import asyncio
+import io
+import unittest
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+import octokit
+from octokit.aio import AsyncClient
+
+
+RATE_LIMIT = {
+    'X-RateLimit-Remaining': '56',
+    'X-RateLimit-Reset': '1446804464',
+    'X-RateLimit-Limit': '60'
+}
+
+
+class TestAio(unittest.IsolatedAsyncioTestCase):
+    """Tests the functionality in octokit/aio.py against a local server"""
+
+    async def asyncSetUp(self):
+        self.requests = []
+        app = web.Application()
+        app.router.add_get('/', self.root)
+        app.router.add_get('/users/{user}', self.user)
+        app.router.add_get('/items', self.items)
+        self.server = TestServer(app)
+        await self.server.start_server()
+
+        self.url = str(self.server.make_url(''))
+        self.client = AsyncClient(api_endpoint=self.url, limit=2)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+
+    async def root(self, request):
+        self.requests.append(request.path_qs)
+        return web.json_response({
+            'user_url': self.url + '/users/{user}',
+            'items_url': self.url + '/items',
+        }, headers=RATE_LIMIT)
+
+    async def user(self, request):
+        self.requests.append(request.path_qs)
+        user = request.match_info['user']
+        if user == 'ghost':
+            return web.json_response({'message': 'Not Found'}, status=404)
+        return web.json_response({'login': user, 'id': 1},
+                                 headers=RATE_LIMIT)
+
+    async def items(self, request):
+        self.requests.append(request.path_qs)
+        page = int(request.query.get('page', 1))
+        headers = dict(RATE_LIMIT)
+        if page < 3:
+            headers['Link'] = (
+                '<{0}/items?page={1}&per_page=2>; rel="next", '
+                '<{0}/items?page=3&per_page=2>; rel="last"'
+            ).format(self.url, page + 1)
+        return web.json_response(['%d-a' % page, '%d-b' % page],
+                                 headers=headers)
+
+    async def test_navigation(self):
+        async with self.client as client:
+            user = await client.user('octocat')
+            self.assertEqual(user.login, 'octocat')
+            self.assertIsInstance(user, octokit.aio.AsyncResource)
+            self.assertEqual(client.rate_limit.remaining, 56)
+
+    async def test_unloaded(self):
+        with self.assertRaises(Exception) as cm:
+            self.client.user
+        self.assertIn('await', cm.exception.args[0])
+
+    async def test_handle_status(self):
+        async with self.client as client:
+            with self.assertRaises(octokit.exceptions.NotFound):
+                await client.user('ghost')
+
+    async def test_concurrent(self):
+        async with self.client as client:
+            users = await asyncio.gather(*[
+                client.user('user%d' % i) for i in range(10)
+            ])
+        self.assertEqual([u.login for u in users],
+                         ['user%d' % i for i in range(10)])
+
+    async def test_paginate(self):
+        client = AsyncClient(api_endpoint=self.url + '/items')
+        client.auto_paginate = True
+        try:
+            response = await client.paginate(per_page=2)
+        finally:
+            await client.close()
+        self.assertEqual([r.schema for r in response.schema],
+                         ['1-a', '1-b', '2-a', '2-b', '3-a', '3-b'])
+
+    async def test_iter_paginate(self):
+        client = AsyncClient(api_endpoint=self.url + '/items')
+        try:
+            items = [item.schema async for item in
+                     client.iter_paginate(per_page=2, prefetch=True)]
+        finally:
+            await client.close()
+        self.assertEqual(items, ['1-a', '1-b', '2-a', '2-b', '3-a', '3-b'])
+
+    async def test_stream(self):
+        client = AsyncClient(api_endpoint=self.url + '/items')
+        try:
+            items = [item.schema async for item in client.stream(chunk_size=3)]
+            with self.assertRaises(octokit.exceptions.NotFound):
+                user = octokit.aio.AsyncResource(
+                    client.session, name='user', client=client,
+                    url=self.url + '/users/{user}')
+                async for _ in user.stream(user='ghost'):
+                    pass
+        finally:
+            await client.close()
+        self.assertEqual(items, ['1-a', '1-b'])
+
+    async def test_raw_pages(self):
+        client = AsyncClient(api_endpoint=self.url + '/items')
+        output = io.BytesIO()
+        try:
+            items = await client.paginate(per_page=2, raw=True,
+                                          auto_paginate=True)
+            pages = await client.paginate(per_page=2, raw='bytes',
+                                          auto_paginate=True)
+            with octokit.NDJSONSink(output) as sink:
+                count = await client.export(sink, per_page=2, prefetch=True)
+        finally:
+            await client.close()
+
+        expected = ['1-a', '1-b', '2-a', '2-b', '3-a', '3-b']
+        self.assertEqual(items, expected)
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(count, 6)
+        self.assertEqual(output.getvalue().decode('utf-8').split(),
+                         ['"%s"' % item for item in expected])
@@ -0,0 +1,15 @@
+import sys
+import unittest
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# The asyncio tests use the syntax and test helpers of Python 3.8+: only
+# import them there, so that older interpreters can collect this module
+if aiohttp is not None and sys.version_info >= (3, 8):
+    from .aio_cases import TestAio  # noqa: F401
+
+if __name__ == '__main__':
+    unittest.main()
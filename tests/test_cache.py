@@ -0,0 +1,168 @@
+import shutil
+import tempfile
+import unittest
+
+import requests_mock
+import uritemplate
+
+import octokit
+from octokit.cache import CacheEntry
+
+
+class TestCache(unittest.TestCase):
+    """Tests the functionality in octokit/cache.py"""
+
+    def setUp(self):
+        self.client = octokit.Client(api_endpoint='mock://api.com/{param}',
+                                     cache=octokit.MemoryCache())
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+        self.url = uritemplate.expand(self.client.url, {'param': 'foo'})
+
+    def register_etag(self):
+        def callback(request, context):
+            if request.headers.get('If-None-Match') == '"abc"':
+                context.status_code = 304
+                return ''
+            context.headers['ETag'] = '"abc"'
+            return '{"login": "octocat"}'
+
+        self.adapter.register_uri('GET', self.url, text=callback)
+
+    def test_not_modified(self):
+        """Test that 304 responses are built from the cached body."""
+        self.register_etag()
+
+        first = self.client(param='foo')
+        second = self.client(param='foo')
+
+        self.assertEqual(first.login, 'octocat')
+        self.assertEqual(second.response.status_code, 304)
+        self.assertEqual(second.login, 'octocat')
+        self.assertEqual(self.client.cache.info()['misses'], 1)
+        self.assertEqual(self.client.cache.info()['hits'], 1)
+        self.assertEqual(self.client.cache.info()['not_modified'], 1)
+
+    def test_last_modified(self):
+        """Test that requests are revalidated with If-Modified-Since."""
+        date = 'Thu, 05 Nov 2015 10:00:00 GMT'
+
+        def callback(request, context):
+            if request.headers.get('If-Modified-Since') == date:
+                context.status_code = 304
+                return ''
+            context.headers['Last-Modified'] = date
+            return '[1, 2]'
+
+        self.adapter.register_uri('GET', self.url, text=callback)
+        self.client(param='foo')
+        response = self.client(param='foo')
+        self.assertEqual(response.response.status_code, 304)
+        self.assertEqual([r.schema for r in response.schema], [1, 2])
+
+    def test_credentials(self):
+        """Test that entries are not shared between credentials."""
+        self.register_etag()
+        self.client(param='foo')
+        self.client.session.auth = ('octocat', 'token')
+        try:
+            response = self.client(param='foo')
+        finally:
+            self.client.session.auth = None
+        self.assertEqual(response.response.status_code, 200)
+        self.assertEqual(self.client.cache.misses, 2)
+
+    def test_negative_cache(self):
+        """Test that requests finding nothing are not repeated."""
+        now = [1000]
+        client = octokit.Client(api_endpoint='mock://api.com/{param}',
+                                negative_ttl=60)
+        client.negative_cache.clock = lambda: now[0]
+        client.session.mount('mock', self.adapter)
+        self.adapter.register_uri('GET', self.url, text='[]')
+        self.adapter.register_uri('GET', 'mock://api.com/gone',
+                                  status_code=404)
+
+        for _ in range(3):
+            self.assertEqual(len(client(param='foo').schema), 0)
+            with self.assertRaises(octokit.exceptions.NotFound):
+                client(param='gone')
+        self.assertEqual(self.adapter.call_count, 2)
+        self.assertEqual(client.negative_cache.info()['hits'], 4)
+
+        now[0] += 61
+        client(param='foo')
+        self.assertEqual(self.adapter.call_count, 3)
+
+    def test_memory_cache_budget(self):
+        cache = octokit.MemoryCache(max_bytes=10)
+        cache.set('a', CacheEntry('"a"', body=b'12345'))
+        cache.set('b', CacheEntry('"b"', body=b'12345'))
+        cache.get('a')
+        cache.set('c', CacheEntry('"c"', body=b'123'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a').etag, '"a"')
+        self.assertEqual(cache.size, 8)
+
+        cache.set('d', CacheEntry('"d"', body=b'12345678901'))
+        self.assertIsNone(cache.get('d'))
+        self.assertEqual(len(cache), 2)
+
+    def test_file_cache(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        cache = octokit.FileCache(directory)
+        cache.set('a', CacheEntry('"a"', 'today', b'{"x": 1}\n[]',
+                                  {'Link': '<x>; rel="next"'}))
+        entry = octokit.FileCache(directory).get('a')
+        self.assertEqual(entry.headers, {'Link': '<x>; rel="next"'})
+        self.assertEqual(entry.etag, '"a"')
+        self.assertEqual(entry.last_modified, 'today')
+        self.assertEqual(entry.body, b'{"x": 1}\n[]')
+
+        cache.delete('a')
+        self.assertIsNone(cache.get('a'))
+
+    def test_file_cache_backend(self):
+        """Test that a file cache encodes with the client's JSON backend."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+
+        cache = octokit.FileCache(directory)
+        client = octokit.Client(cache=cache, json_backend='json')
+        self.assertIs(cache.backend, client.json_backend)
+        backend = octokit.jsonlib.get_backend('json')
+        self.assertIs(octokit.FileCache(directory, backend).backend, backend)
+
+    def test_paginate_not_modified(self):
+        """Test that pages revalidated by the cache keep their links."""
+        rate_limit = {'X-RateLimit-Remaining': '56',
+                      'X-RateLimit-Reset': '1446804464',
+                      'X-RateLimit-Limit': '60'}
+
+        def page(number, link=None):
+            def callback(request, context):
+                etag = '"page%d"' % number
+                if request.headers.get('If-None-Match') == etag:
+                    context.status_code = 304
+                    return ''
+                context.headers['ETag'] = etag
+                context.headers.update(rate_limit)
+                if link:
+                    context.headers['Link'] = link
+                return '["%d"]' % number
+            return callback
+
+        self.adapter.register_uri(
+            'GET', self.url,
+            text=page(1, '<%s?page=2>; rel="next"' % self.url))
+        self.adapter.register_uri('GET', self.url + '?page=2', text=page(2))
+
+        for _ in range(2):
+            response = self.client.paginate(param='foo', auto_paginate=True)
+            self.assertEqual(len(response.schema), 2)
+        self.assertEqual(self.client.cache.info()['not_modified'], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import itertools
+import threading
+import unittest
+
+import requests
+import requests_mock
+
+import octokit
+
+
+class TestClient(unittest.TestCase):
+    """Tests the functionality in octokit/client.py"""
+
+    def test_own_session(self):
+        """Test that clients don't share their session and hooks."""
+        first = octokit.Client(api_endpoint='mock://api.com/')
+        second = octokit.Client(api_endpoint='mock://api.com/')
+        self.assertIsNot(first.session, second.session)
+
+        adapter = requests_mock.Adapter()
+        adapter.register_uri('GET', 'mock://api.com/', text='{}')
+        first.session.mount('mock', adapter)
+        first.get()
+
+        self.assertIsNotNone(first.last_response)
+        self.assertIsNone(second.last_response)
+
+    def test_pool_options(self):
+        client = octokit.Client(pool_connections=4, pool_maxsize=32,
+                                pool_block=True)
+        adapter = client.session.get_adapter('https://api.github.com')
+        self.assertEqual(adapter._pool_connections, 4)
+        self.assertEqual(adapter._pool_maxsize, 32)
+        self.assertTrue(adapter._pool_block)
+        self.assertIsNot(adapter, requests.Session().get_adapter('https://'))
+
+    def test_keep_alive(self):
+        self.assertNotEqual(
+            octokit.Client().session.headers.get('Connection'), 'close')
+        self.assertEqual(
+            octokit.Client(keep_alive=False).session.headers['Connection'],
+            'close')
+
+    def test_given_session(self):
+        session = requests.Session()
+        client = octokit.Client(session=session)
+        self.assertIs(client.session, session)
+
+    def test_threads(self):
+        """Test that one client can be hammered from many threads."""
+        client = octokit.Client(api_endpoint='mock://api.com/{param}',
+                                cache=octokit.MemoryCache())
+        adapter = requests_mock.Adapter()
+        client.session.mount('mock', adapter)
+        counter = itertools.count(1)
+
+        def callback(request, context):
+            # limit + remaining is the same for every response, so that
+            # torn rate limit reads can be told
+            k = next(counter)
+            context.headers.update({
+                'X-RateLimit-Limit': str(10000 + k),
+                'X-RateLimit-Remaining': str(10000 - k),
+                'X-RateLimit-Reset': '1446804464',
+            })
+            return '{"id": %d}' % k
+
+        adapter.register_uri('GET', requests_mock.ANY, text=callback)
+        errors = []
+
+        def worker(name):
+            try:
+                for i in range(50):
+                    client.get(param='%s-%d' % (name, i))
+                    url = client.last_response.url
+                    assert url.endswith('/%s-%d' % (name, i)), url
+                    rate_limit = client.rate_limit
+                    assert rate_limit.limit + rate_limit.remaining == 20000
+                    client.paginate(param=name, auto_paginate=False)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(str(n),))
+                   for n in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        total = 16 * 50 * 2
+        self.assertEqual(adapter.call_count, total)
+        self.assertEqual(client.rate_limit.remaining, 10000 - total)
+        info = client.cache.info()
+        self.assertEqual(info['hits'] + info['misses'], total)
+
+if __name__ == '__main__':
+    unittest.main()
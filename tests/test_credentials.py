@@ -0,0 +1,158 @@
+import unittest
+
+import requests_mock
+
+import octokit
+from octokit.credentials import CredentialPool, owner_affinity
+
+
+def rate_limit_headers(remaining, reset=4600):
+    return {'X-RateLimit-Remaining': str(remaining),
+            'X-RateLimit-Reset': str(reset),
+            'X-RateLimit-Limit': '5000'}
+
+
+class TestCredentials(unittest.TestCase):
+    """Tests the functionality in octokit/credentials.py"""
+
+    def setUp(self):
+        self.adapter = requests_mock.Adapter()
+        self.pool = CredentialPool(['a', 'b'], clock=lambda: 1000)
+        self.client = self.make_client(self.pool)
+
+    def make_client(self, pool):
+        client = octokit.Client(api_endpoint='mock://api.com/{owner}',
+                                credentials=pool)
+        client.session.mount('mock', self.adapter)
+        return client
+
+    def register(self, token, responses, url='mock://api.com/octocat'):
+        self.adapter.register_uri(
+            'GET', url, responses,
+            request_headers={'Authorization': 'token %s' % token})
+
+    def tokens(self):
+        return [r.headers['Authorization'][len('token '):]
+                for r in self.adapter.request_history]
+
+    def test_most_remaining(self):
+        """Test that requests go to the credential with the most budget."""
+        self.register('a', [{'text': '{}', 'headers': rate_limit_headers(10)}])
+        self.register('b', [{'text': '{}', 'headers': rate_limit_headers(50)}])
+
+        for _ in range(3):
+            self.client.get(owner='octocat')
+
+        self.assertEqual(self.tokens(), ['a', 'b', 'b'])
+        self.assertEqual(self.client.rate_limit.remaining, 60)
+        self.assertEqual(self.client.rate_limit.limit, 10000)
+        self.assertEqual(self.pool.info()['#%d' % id(self.pool.credentials[1])],
+                         {'requests': 2, 'remaining': 50})
+
+    def test_fail_over(self):
+        """Test that exhausted credentials are replaced by another one."""
+        self.register('a', [{'status_code': 403,
+                             'text': '{"message": "API rate limit exceeded"}',
+                             'headers': rate_limit_headers(0)}])
+        self.register('b', [{'text': '{"ok": true}',
+                             'headers': rate_limit_headers(50)}])
+
+        self.assertTrue(self.client.get(owner='octocat').ok)
+        self.assertTrue(self.client.get(owner='octocat').ok)
+        self.assertEqual(self.tokens(), ['a', 'b', 'b'])
+
+    def test_fail_over_throttled(self):
+        """Test that the throttle doesn't wait while a credential has a
+        budget.
+        """
+        self.client.throttle = octokit.Throttle(clock=lambda: 1000,
+                                               sleep=self.fail)
+        self.test_fail_over()
+
+    def test_all_exhausted(self):
+        for token in 'ab':
+            self.register(token, [{'status_code': 403,
+                                   'text': '{"message": "API rate limit"}',
+                                   'headers': rate_limit_headers(0)}])
+
+        with self.assertRaises(octokit.exceptions.Unauthorized):
+            self.client.get(owner='octocat')
+        self.assertEqual(self.tokens(), ['a', 'b'])
+
+    def test_other_errors(self):
+        """Test that errors unrelated to the rate limit aren't retried."""
+        self.register('a', [{'status_code': 403,
+                             'text': '{"message": "Bad credentials"}'}])
+
+        with self.assertRaises(octokit.exceptions.Unauthorized):
+            self.client.get(owner='octocat')
+        self.assertEqual(self.tokens(), ['a'])
+
+    def test_strict_affinity(self):
+        """Test that requests about an owner stick to its credential."""
+        pool = CredentialPool(['a', 'b'], affinity=owner_affinity,
+                              strict_affinity=True, clock=lambda: 1000)
+        client = self.make_client(pool)
+        client.url = 'mock://api.com/repos/{owner}'
+        for token, remaining in (('a', 10), ('b', 50)):
+            for owner in ('octocat', 'github'):
+                self.register(token, [{'text': '{}',
+                                       'headers': rate_limit_headers(
+                                           remaining)}],
+                              url='mock://api.com/repos/%s' % owner)
+
+        for owner in ('octocat', 'github', 'octocat', 'octocat'):
+            client.get(owner=owner)
+
+        self.assertEqual(self.tokens(), ['a', 'b', 'a', 'a'])
+
+    def strict_pool(self, **kwargs):
+        """Return a client whose credential `a` can't see github"""
+        pool = CredentialPool(['a', 'b'], affinity=owner_affinity,
+                              strict_affinity=True, clock=lambda: 1000,
+                              **kwargs)
+        client = self.make_client(pool)
+        client.url = 'mock://api.com/repos/{owner}'
+        self.register('a', [{'status_code': 404,
+                             'text': '{"message": "Not Found"}',
+                             'headers': rate_limit_headers(50)}],
+                      url='mock://api.com/repos/github')
+        for token, remaining in (('a', 50), ('b', 10)):
+            self.register(token, [{'text': '{}',
+                                   'headers': rate_limit_headers(remaining)}],
+                          url='mock://api.com/repos/octocat')
+        self.register('b', [{'text': '{}', 'headers': rate_limit_headers(10)}],
+                      url='mock://api.com/repos/github')
+        return client
+
+    def test_strict_affinity_discovery(self):
+        """Test that a key sticks to the first credential that can see it."""
+        client = self.strict_pool()
+        for owner in ('github', 'github', 'octocat', 'github'):
+            client.get(owner=owner)
+
+        self.assertEqual(self.tokens(), ['a', 'b', 'b', 'a', 'b'])
+
+    def test_strict_affinity_owners(self):
+        """Test that keys stick to the credentials given for them."""
+        client = self.strict_pool(owners={'github': 'b'})
+        for owner in ('github', 'octocat', 'github'):
+            client.get(owner=owner)
+
+        self.assertEqual(self.tokens(), ['b', 'a', 'b'])
+        with self.assertRaises(ValueError):
+            CredentialPool(['a'], owners={'github': 'c'})
+
+    def test_affinities_bounded(self):
+        pool = CredentialPool(['a', 'b'], affinity=owner_affinity,
+                              max_affinities=2)
+        client = self.make_client(pool)
+        client.url = 'mock://api.com/repos/{owner}'
+        self.adapter.register_uri('GET', requests_mock.ANY, text='{}')
+        for owner in ('a', 'b', 'c', 'd'):
+            client.get(owner=owner)
+
+        self.assertEqual(len(pool._affinities), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -25,5 +25,14 @@ class TestExceptions(unittest.TestCase):
             with self.assertRaises(exception):
                 self.client.get()
 
+    def test_error_message(self):
+        """Test that error bodies are decoded into the exception message."""
+        self.adapter.register_uri('GET', self.client.url, status_code=422,
+                                  text='{"message": "Validation Failed"}')
+
+        with self.assertRaises(octokit.exceptions.UnprocessableEntity) as cm:
+            self.client.get()
+        self.assertEqual(cm.exception.message, 'Validation Failed')
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+
+import requests_mock
+
+import octokit
+
+
+class TestFanOut(unittest.TestCase):
+    """Tests the functionality in octokit/fanout.py"""
+
+    def setUp(self):
+        self.client = octokit.Client(api_endpoint='mock://api.com/')
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+        self.repo = octokit.Resource(self.client.session, name='repo',
+                                     url='mock://api.com/repos/{owner}/{repo}',
+                                     client=self.client)
+        for name in range(10):
+            self.adapter.register_uri(
+                'GET', 'mock://api.com/repos/octocat/%d' % name,
+                text='{"name": "%d"}' % name)
+        self.adapter.register_uri('GET', 'mock://api.com/repos/octocat/nope',
+                                  status_code=404)
+
+    def test_fetch_many(self):
+        arguments = [{'owner': 'octocat', 'repo': str(name)}
+                     for name in range(10)]
+        results = self.client.fetch_many(self.repo, arguments, concurrency=4)
+
+        self.assertEqual([r.name for r in results],
+                         [str(name) for name in range(10)])
+        self.assertEqual(self.adapter.call_count, 10)
+
+    def test_errors(self):
+        """Test that errors are returned in place of their resource."""
+        arguments = [{'owner': 'octocat', 'repo': 'nope'},
+                     {'owner': 'octocat', 'repo': '1'}]
+        results = self.client.fetch_many(self.repo, arguments)
+
+        self.assertIsInstance(results[0], octokit.exceptions.NotFound)
+        self.assertEqual(results[1].name, '1')
+
+    def test_unordered(self):
+        user = octokit.Resource(self.client.session, name='user',
+                                url='mock://api.com/users/{user}',
+                                client=self.client)
+        for login in ('a', 'b', 'c'):
+            self.adapter.register_uri('GET', 'mock://api.com/users/' + login,
+                                      text='{"login": "%s"}' % login)
+
+        results = self.client.fetch_many(user, ['a', 'b', 'c'],
+                                         ordered=False)
+        self.assertEqual(sorted((i, r.login) for i, r in results),
+                         [(0, 'a'), (1, 'b'), (2, 'c')])
+
+    def test_empty(self):
+        self.assertEqual(self.client.fetch_many(self.repo, []), [])
+        self.assertEqual(list(self.client.fetch_many(self.repo, [],
+                                                     ordered=False)), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import json
+import unittest
+
+import requests_mock
+
+import octokit
+from octokit.graphql import graphql_endpoint, literal
+
+
+class TestGraphQL(unittest.TestCase):
+    """Tests the functionality in octokit/graphql.py"""
+
+    def setUp(self):
+        self.client = octokit.Client(api_endpoint='mock://api.com')
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+
+    def test_endpoint(self):
+        self.assertEqual(graphql_endpoint('https://api.github.com'),
+                         'https://api.github.com/graphql')
+        self.assertEqual(graphql_endpoint('https://ghe.local/api/v3/'),
+                         'https://ghe.local/api/graphql')
+
+    def test_literal(self):
+        self.assertEqual(literal('a"b'), '"a\\"b"')
+        self.assertEqual(literal(True), 'true')
+        self.assertEqual(literal(None), 'null')
+        self.assertEqual(literal({'b': [1, 2], 'a': 'x'}),
+                         '{a: "x", b: [1, 2]}')
+
+    def test_graphql(self):
+        self.adapter.register_uri('POST', 'mock://api.com/graphql', json={
+            'data': {'repository': {'pullRequest': {
+                'title': 'Fix', 'labels': {'nodes': [{'name': 'bug'}]}}}}
+        })
+
+        result = self.client.graphql('query($n: Int!) { ... }', {'n': 1})
+        body = self.adapter.last_request.json()
+        self.assertEqual(body['variables'], {'n': 1})
+
+        pull = result.repository.pullRequest
+        self.assertEqual(pull.title, 'Fix')
+        self.assertEqual([l.name for l in pull.labels.nodes], ['bug'])
+
+    def test_errors(self):
+        self.adapter.register_uri('POST', 'mock://api.com/graphql', json={
+            'data': None,
+            'errors': [{'message': 'Parse error'}]
+        })
+
+        with self.assertRaises(octokit.exceptions.GraphQLError) as cm:
+            self.client.graphql('query {')
+        self.assertEqual(cm.exception.message, 'Parse error')
+
+    def test_batch(self):
+        def callback(request, context):
+            query = request.json()['query']
+            data = {}
+            for alias in ('l0', 'l1', 'l2'):
+                if alias + ':' in query:
+                    data[alias] = {'pullRequest': {'title': alias}}
+            errors = []
+            if 'l1:' in query:
+                data['l1'] = None
+                errors.append({'message': 'Not found', 'path': ['l1']})
+            return json.dumps({'data': data, 'errors': errors})
+
+        self.adapter.register_uri('POST', 'mock://api.com/graphql',
+                                  text=callback)
+
+        batch = self.client.graphql_batch(size=2)
+        for number in (1, 2, 3):
+            batch.add('repository', {'owner': 'octocat', 'name': 'hello'},
+                      'pullRequest(number: %d) { title }' % number)
+        results = batch.execute()
+
+        self.assertEqual(self.adapter.call_count, 2)
+        query = self.adapter.request_history[0].json()['query']
+        self.assertEqual(query, (
+            'query { '
+            'l0: repository(name: "hello", owner: "octocat") '
+            '{ pullRequest(number: 1) { title } } '
+            'l1: repository(name: "hello", owner: "octocat") '
+            '{ pullRequest(number: 2) { title } } }'))
+
+        self.assertEqual(results[0].pullRequest.title, 'l0')
+        self.assertIsInstance(results[1], octokit.exceptions.GraphQLError)
+        self.assertEqual(results[2].pullRequest.title, 'l0')
+        self.assertEqual(len(batch), 0)
+
+    def test_batch_failed_query(self):
+        """Test that a query failing as a whole fails its lookups only."""
+        ok = {'json': {'data': {'l0': {'login': 'a'}, 'l1': {'login': 'b'}}}}
+        self.adapter.register_uri('POST', 'mock://api.com/graphql', [
+            ok,
+            {'json': {'data': None, 'errors': [{'message': 'Timeout'}]}},
+            ok,
+            {'status_code': 502, 'json': {'message': 'Bad Gateway'}},
+            ok])
+
+        batch = self.client.graphql_batch(size=2)
+        for login in 'abcdef':
+            batch.add('user', {'login': login}, 'login')
+        results = batch.execute()
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual([r.login for r in results[:2] + results[4:]],
+                         ['a', 'b', 'a', 'b'])
+        for result in results[2:4]:
+            self.assertIsInstance(result, octokit.exceptions.GraphQLError)
+            self.assertEqual(result.message, 'Timeout')
+        self.assertEqual(len(batch), 0)
+
+        for login in 'gh':
+            batch.add('user', {'login': login}, 'login')
+        with self.assertRaises(octokit.exceptions.ServerError):
+            batch.execute()
+        self.assertEqual(len(batch), 2)
+        self.assertEqual([r.login for r in batch.execute()], ['a', 'b'])
+
+    def test_rate_limit(self):
+        """Test that GraphQL responses don't update the REST rate limit."""
+        self.adapter.register_uri('POST', 'mock://api.com/graphql',
+                                  json={'data': {}}, headers={
+                                      'X-RateLimit-Remaining': '4999',
+                                      'X-RateLimit-Reset': '1446804464',
+                                      'X-RateLimit-Limit': '5000',
+                                      'X-RateLimit-Resource': 'graphql'})
+        self.client.graphql('query { viewer { login } }')
+        self.assertIsNone(self.client._rate_limit.remaining)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+import requests_mock
+
+import octokit
+from octokit.jsonlib import available_backends, get_backend
+
+
+class TestJSONLib(unittest.TestCase):
+    """Tests the functionality in octokit/jsonlib.py"""
+
+    def test_backends(self):
+        """Test that every installed backend decodes bytes and text alike."""
+        self.assertIn('json', available_backends())
+        for name in available_backends():
+            backend = get_backend(name)
+            self.assertEqual(backend.name, name)
+            for body in (b'{"login": "octocat"}', u'{"login": "octocat"}'):
+                self.assertEqual(backend.loads(body), {'login': 'octocat'})
+            self.assertEqual(backend.loads(backend.dumps([1, None])),
+                             [1, None])
+
+    def test_default_backend(self):
+        self.assertEqual(get_backend().name, available_backends()[0])
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            get_backend('yaml')
+
+    def test_client_backend(self):
+        client = octokit.Client(api_endpoint='mock://api.com/',
+                                json_backend='json')
+        adapter = requests_mock.Adapter()
+        client.session.mount('mock', adapter)
+        adapter.register_uri('GET', 'mock://api.com/', text='{"a": 1}')
+        adapter.register_uri('GET', 'mock://api.com/nope', status_code=404,
+                             text='{"message": "Not Found"}')
+
+        self.assertEqual(client.json_backend.name, 'json')
+        self.assertEqual(client.get().a, 1)
+        with self.assertRaises(octokit.exceptions.NotFound):
+            client.child(url='mock://api.com/nope').get()
+
+if __name__ == '__main__':
+    unittest.main()
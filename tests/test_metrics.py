@@ -0,0 +1,150 @@
+import unittest
+
+import requests_mock
+
+import octokit
+from octokit.metrics import Histogram
+
+
+class TestMetrics(unittest.TestCase):
+    """Tests the functionality in octokit/metrics.py"""
+
+    def setUp(self):
+        self.reports = []
+        self.aggregator = octokit.MetricsAggregator()
+        self.client = octokit.Client(
+            api_endpoint='mock://api.com/',
+            instruments=[self.reports.append, self.aggregator])
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+        self.user = octokit.Resource(self.client.session, name='user',
+                                     url='mock://api.com/users/{user}',
+                                     client=self.client)
+        self.adapter.register_uri(
+            'GET', 'mock://api.com/users/octocat', text='{"login": "octocat"}',
+            headers={'X-RateLimit-Limit': '5000',
+                     'X-RateLimit-Remaining': '4999',
+                     'X-RateLimit-Reset': '1445809428'})
+        self.adapter.register_uri('GET', 'mock://api.com/users/nope',
+                                  status_code=404)
+
+    def test_report(self):
+        """Test that requests are reported by URI template."""
+        user = self.user('octocat')
+        self.assertEqual(user.login, 'octocat')
+
+        metrics, = self.reports
+        self.assertEqual((metrics.method, metrics.endpoint, metrics.status),
+                         ('GET', 'mock://api.com/users/{user}', 200))
+        self.assertEqual(metrics.bytes, len('{"login": "octocat"}'))
+        self.assertEqual(metrics.rate_limit_remaining, 4999)
+        for name in ('network', 'decode', 'parse', 'total'):
+            self.assertGreaterEqual(getattr(metrics, name), 0)
+        self.assertGreaterEqual(metrics.total, metrics.network)
+
+    def test_expanded_urls(self):
+        """Test that requests to expanded URLs are reported by the URI
+        template they come from."""
+        for id, login in enumerate(('octocat', 'hubot')):
+            self.adapter.register_uri(
+                'GET', 'mock://api.com/users/%s' % login,
+                text='{"login": "%s", "url": "mock://api.com/users/%s", '
+                     '"repos_url": "mock://api.com/users/%s/repos"}'
+                     % (login, login, login))
+            self.adapter.register_uri(
+                'GET', 'mock://api.com/users/%s/repos' % login, text='[]',
+                headers={'Link': '<mock://api.com/user/%d/repos?page=2>; '
+                                 'rel="next"' % id})
+            self.adapter.register_uri(
+                'GET', 'mock://api.com/user/%d/repos?page=2' % id,
+                text='[]')
+            repos = self.user(login).repos()
+            repos.rels['next'].get()
+
+        self.assertEqual([m.endpoint for m in self.reports],
+                         ['mock://api.com/users/{user}',
+                          'mock://api.com/users/{user}/repos',
+                          'mock://api.com/users/{user}/repos'] * 2)
+        stats = self.aggregator.summary()
+        self.assertEqual(
+            sorted((key, stats[key]['timings']['total']['count'])
+                   for key in stats),
+            [(('GET', 'mock://api.com/users/{user}'), 2),
+             (('GET', 'mock://api.com/users/{user}/repos'), 4)])
+
+    def test_max_endpoints(self):
+        """Test that endpoints beyond the limit are counted together."""
+        aggregator = octokit.MetricsAggregator(max_endpoints=1)
+        self.client.add_instrument(aggregator)
+        self.user('octocat')
+        self.client.child(url='mock://api.com/users/octocat',
+                          name='user').get()
+        self.client.child(url='mock://api.com/users/octocat?page=2',
+                          name='user').get()
+
+        summary = aggregator.summary()
+        self.assertEqual(sorted(summary), [
+            ('GET', octokit.MetricsAggregator.OTHER),
+            ('GET', 'mock://api.com/users/{user}')])
+        self.assertEqual(summary[('GET', octokit.MetricsAggregator.OTHER)][
+            'timings']['total']['count'], 2)
+
+    def test_raw_pages(self):
+        """Test that the pages of raw pagination are reported too."""
+        url = 'mock://api.com/users/octocat/repos'
+        self.adapter.register_uri('GET', url, text='["a"]', headers={
+            'Link': '<mock://api.com/user/1/repos?page=2>; rel="next"'})
+        self.adapter.register_uri('GET', 'mock://api.com/user/1/repos?page=2',
+                                  text='["b"]')
+        self.client.url = 'mock://api.com/users/{user}/repos'
+
+        self.assertEqual(self.client.paginate(user='octocat', raw=True,
+                                              auto_paginate=True),
+                         ['a', 'b'])
+        self.assertEqual([(m.endpoint, m.parse is None, m.decode >= 0)
+                          for m in self.reports],
+                         [('mock://api.com/users/{user}/repos', True, True)]
+                         * 2)
+
+    def test_errors(self):
+        with self.assertRaises(octokit.exceptions.NotFound):
+            self.user('nope')
+
+        metrics, = self.reports
+        self.assertEqual(metrics.status, 404)
+        self.assertIsInstance(metrics.error, octokit.exceptions.NotFound)
+
+    def test_aggregator(self):
+        for _ in range(3):
+            self.user('octocat')
+        with self.assertRaises(octokit.exceptions.NotFound):
+            self.user('nope')
+
+        stats = self.aggregator.summary()[
+            ('GET', 'mock://api.com/users/{user}')]
+        self.assertEqual(stats['statuses'], {200: 3, 404: 1})
+        self.assertEqual(stats['timings']['total']['count'], 4)
+        self.assertEqual(stats['timings']['parse']['count'], 3)
+        self.assertEqual(stats['rate_limit_remaining'], 4999)
+
+    def test_disabled(self):
+        """Test that requests aren't measured without instruments."""
+        self.client.remove_instrument(self.reports.append)
+        self.client.remove_instrument(self.aggregator)
+        self.client.measure = None
+
+        self.assertEqual(self.user('octocat').login, 'octocat')
+        self.assertEqual(self.reports, [])
+
+    def test_histogram(self):
+        histogram = Histogram(base=1, size=4)
+        for value in (0.5, 1.5, 3, 3, 100):
+            histogram.add(value)
+
+        self.assertEqual(histogram.counts, [1, 1, 2, 0, 1])
+        self.assertEqual(histogram.quantile(0.5), 4)
+        self.assertEqual(histogram.quantile(1), 100)
+        self.assertEqual(histogram.summary()['mean'], 108 / 5.0)
+
+if __name__ == '__main__':
+    unittest.main()
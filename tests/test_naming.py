@@ -0,0 +1,63 @@
+import threading
+import unittest
+
+from octokit.naming import NameCache
+
+
+class TestNaming(unittest.TestCase):
+    """Tests the functionality in octokit/naming.py"""
+
+    def setUp(self):
+        self.names = NameCache(maxsize=2)
+
+    def test_inflection(self):
+        self.assertEqual(self.names.humanize('pull_request'), 'Pull request')
+        self.assertEqual(self.names.singularize('pull_requests'),
+                         'Pull request')
+
+    def test_counters(self):
+        self.names.humanize('owner')
+        self.names.humanize('owner')
+        self.names.singularize('owner')
+
+        info = self.names.info()
+        self.assertEqual(info['hits'], 1)
+        self.assertEqual(info['misses'], 2)
+        self.assertEqual(info['size'], 2)
+
+        self.names.clear()
+        self.assertEqual(self.names.info()['misses'], 0)
+        self.assertEqual(len(self.names), 0)
+
+    def test_bounded(self):
+        self.names.humanize('owner')
+        self.names.humanize('repo')
+        self.names.humanize('owner')
+        self.names.humanize('user')
+        self.assertEqual(len(self.names), 2)
+
+        # 'repo' was the least recently used name
+        self.names.humanize('owner')
+        self.names.humanize('repo')
+        self.assertEqual(self.names.info()['hits'], 2)
+
+    def test_threads(self):
+        names = NameCache()
+        keys = ['key_%d' % i for i in range(50)]
+
+        def worker():
+            for key in keys * 20:
+                names.humanize(key)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        info = names.info()
+        self.assertEqual(info['hits'] + info['misses'], 8 * 50 * 20)
+        self.assertEqual(info['size'], 50)
+
+if __name__ == '__main__':
+    unittest.main()
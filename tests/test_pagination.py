@@ -1,3 +1,5 @@
+import io
+import json
 import os
 import unittest
 
@@ -50,5 +52,113 @@ class TestPagination(unittest.TestCase):
 
         self.assertEqual(resultSchema, expectedSchema)
 
+    def register_pages(self, url, pages, remaining=56):
+        for page in range(1, pages + 1):
+            headers = {
+                'X-RateLimit-Remaining': str(max(remaining - page, 0)),
+                'X-RateLimit-Reset': '1446804464',
+                'X-RateLimit-Limit': '60'
+            }
+            if page < pages:
+                headers['Link'] = (
+                    '<{0}?page={1}&per_page=2>; rel="next", '
+                    '<{0}?page={2}&per_page=2>; rel="last"'
+                ).format(url, page + 1, pages)
+            self.adapter.register_uri(
+                'GET', url + ('?page=%d' % page if page > 1 else ''),
+                headers=headers,
+                text='["%d-a","%d-b"]' % (page, page))
+
+    def test_concurrent_pagination(self):
+        self.client.auto_paginate = True
+        self.client.page_workers = 3
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.register_pages(url, 6)
+
+        response = self.client.paginate(param='foo', per_page=2)
+        resultSchema = [r.schema for r in response.schema]
+        expectedSchema = ['%d-%s' % (page, item)
+                          for page in range(1, 7) for item in 'ab']
+
+        self.assertEqual(resultSchema, expectedSchema)
+        self.assertEqual(self.adapter.call_count, 6)
+
+    def test_concurrent_pagination_rate_limit(self):
+        self.client.auto_paginate = True
+        self.client.page_workers = 3
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.register_pages(url, 6, remaining=3)
+
+        response = self.client.paginate(param='foo', per_page=2)
+        self.assertEqual(len(response.schema), 6)
+        self.assertEqual(self.adapter.call_count, 3)
+
+    def test_iter_paginate(self):
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.register_pages(url, 3)
+
+        items = self.client.iter_paginate(param='foo', per_page=2)
+        self.assertEqual(next(items).schema, '1-a')
+        self.assertEqual(self.adapter.call_count, 1)
+
+        resultSchema = ['1-a'] + [r.schema for r in items]
+        expectedSchema = ['1-a', '1-b', '2-a', '2-b', '3-a', '3-b']
+        self.assertEqual(resultSchema, expectedSchema)
+        self.assertEqual(self.adapter.call_count, 3)
+
+    def test_iter_paginate_prefetch(self):
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.register_pages(url, 3)
+
+        items = self.client.iter_paginate(param='foo', per_page=2,
+                                          prefetch=True)
+        resultSchema = [r.schema for r in items]
+        expectedSchema = ['1-a', '1-b', '2-a', '2-b', '3-a', '3-b']
+        self.assertEqual(resultSchema, expectedSchema)
+        self.assertEqual(self.adapter.call_count, 3)
+
+    def test_page_urls(self):
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.register_pages(url, 4)
+
+        resource = self.client.get(param='foo', params={'per_page': 2})
+        self.assertEqual(self.client.page_urls(resource), [
+            url + '?page=2&per_page=2',
+            url + '?page=3&per_page=2',
+            url + '?page=4&per_page=2',
+        ])
+
+    def test_raw_pagination(self):
+        """Test that raw pagination returns plain items, or page bodies."""
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.register_pages(url, 3)
+
+        items = self.client.paginate(param='foo', per_page=2, raw=True,
+                                     auto_paginate=True)
+        self.assertEqual(items, ['1-a', '1-b', '2-a', '2-b', '3-a', '3-b'])
+
+        pages = self.client.paginate(param='foo', per_page=2, raw='bytes',
+                                     auto_paginate=True)
+        self.assertEqual(pages[1], b'["2-a","2-b"]')
+        self.assertEqual(len(pages), 3)
+
+        first = self.client.paginate(param='foo', per_page=2, raw=True)
+        self.assertEqual(first, ['1-a', '1-b'])
+
+    def test_export(self):
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.register_pages(url, 3)
+
+        output = io.BytesIO()
+        with octokit.NDJSONSink(output) as sink:
+            count = self.client.export(sink, param='foo', per_page=2,
+                                       prefetch=True)
+
+        self.assertEqual(count, 6)
+        self.assertEqual((sink.pages, sink.items), (3, 6))
+        lines = output.getvalue().decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line) for line in lines],
+                         ['1-a', '1-b', '2-a', '2-b', '3-a', '3-b'])
+
 if __name__ == '__main__':
     unittest.main()
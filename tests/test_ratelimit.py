@@ -50,5 +50,43 @@ class TestRateLimit(unittest.TestCase):
 
         self.assertEqual(resultSchema, expectedSchema)
 
+    def test_without_rate_limit(self):
+        """Test that pages are followed when responses don't tell the rate
+        limit, e.g. from GitHub Enterprise with rate limiting disabled."""
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.adapter.register_uri('GET', url, text='["a","b"]', headers={
+            'Link': '<' + url + '?page=2>; rel="next"'})
+        self.adapter.register_uri('GET', url + '?page=2', text='["c","d"]')
+
+        response = self.client.paginate(param='foo', auto_paginate=True)
+        self.assertEqual([r.schema for r in response.schema],
+                         ['a', 'b', 'c', 'd'])
+        self.assertEqual(
+            [item for page in self.client.iter_paginate(param='foo')
+             for item in page.schema], ['a', 'b', 'c', 'd'])
+        self.assertEqual(self.client.paginate(param='foo', raw=True,
+                                              auto_paginate=True),
+                         ['a', 'b', 'c', 'd'])
+        self.assertIsNone(self.client.rate_limit.remaining)
+
+    def test_rate_limit_from_responses(self):
+        """Test that the rate limit is read from responses without requests."""
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        for remaining in ('42', '41'):
+            self.adapter.register_uri('GET', url, text='[]', headers={
+                'X-RateLimit-Remaining': remaining,
+                'X-RateLimit-Reset': '1446804464',
+                'X-RateLimit-Limit': '60'
+            })
+            self.client.get(param='foo')
+
+            self.assertEqual(self.client.rate_limit.remaining, int(remaining))
+            self.assertEqual(self.client.rate_limit.limit, 60)
+            self.assertEqual(self.client.rate_limit.resets_at, 1446804464)
+            self.assertEqual(self.client.rate_limit.resets_in, 0)
+
+        self.assertEqual(self.adapter.call_count, 2)
+        self.assertEqual(self.adapter.last_request.method, 'GET')
+
 if __name__ == '__main__':
     unittest.main()
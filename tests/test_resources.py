@@ -5,6 +5,7 @@ import requests_mock
 import uritemplate
 
 import octokit
+from octokit.jsonlib import JSONBackend
 
 
 class TestResources(unittest.TestCase):
@@ -72,5 +73,125 @@ class TestResources(unittest.TestCase):
         r = octokit.Resource(None, name='Dummy', schema=schema)
         self.assertEqual(r.name, 'octocat')
 
+    def test_lazy_schema(self):
+        """Test that lazy schemas build child resources on first access."""
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.adapter.register_uri('GET', url, text=(
+            '{"login": "octocat", "repos_url": "mock://api.com/repos", '
+            '"plan": {"name": "free"}, "orgs": [{"id": 1}, {"id": 2}]}'))
+
+        response = self.client(param='foo')
+        self.assertIsInstance(response.schema,
+                              octokit.resources.LazySchemaDict)
+        self.assertEqual(response.schema._cache, {})
+        self.assertEqual(sorted(response.keys()),
+                         ['login', 'orgs', 'plan', 'repos'])
+
+        self.assertEqual(response.login, 'octocat')
+        self.assertEqual(response.plan.name, 'free')
+        self.assertIs(response.plan, response.plan)
+        self.assertEqual(response.repos.url, 'mock://api.com/repos')
+        self.assertEqual(response.repos._name, 'Repos')
+        self.assertEqual([org.id for org in response.orgs], [1, 2])
+        self.assertEqual(response.orgs[0]._name, 'Org')
+
+    def test_lazy_schema_list(self):
+        """Test that lazy list schemas build items on first access."""
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.adapter.register_uri('GET', url, text='[{"id": 1}, {"id": 2}]')
+
+        response = self.client(param='foo')
+        self.assertIsInstance(response.schema,
+                              octokit.resources.LazySchemaList)
+        self.assertEqual(len(response.schema), 2)
+        self.assertEqual(response.schema._cache, [None, None])
+
+        self.assertEqual(response[1].id, 2)
+        self.assertIs(response[1], response[1])
+        self.assertIsNone(response.schema._cache[0])
+        self.assertEqual([r.id for r in response.schema[:]], [1, 2])
+
+    def test_single_decode(self):
+        """Test that a response body is only decoded once."""
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.adapter.register_uri('GET', url, text='{"success": true}')
+
+        decoded = []
+        backend = self.client.json_backend
+
+        def counting_loads(s):
+            decoded.append(s)
+            return backend.loads(s)
+
+        self.client.json_backend = JSONBackend('counting', counting_loads,
+                                               backend.dumps)
+        response = self.client(param='foo')
+
+        assert response.success
+        self.assertEqual(len(decoded), 1)
+
+    def test_raw(self):
+        """Test that raw requests return the body without a Resource."""
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.adapter.register_uri('GET', url, text='{"success": true}')
+
+        self.assertEqual(self.client.get(param='foo', raw=True),
+                         {'success': True})
+        self.assertEqual(self.client.get(param='foo', raw='bytes'),
+                         b'{"success": true}')
+
+    def test_empty_schema_loaded(self):
+        """Test that empty schemas are not fetched again."""
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.adapter.register_uri('GET', url, text='[]')
+
+        response = self.client(param='foo')
+        repr(response)
+        self.assertEqual(len(response.schema), 0)
+        self.assertEqual(self.adapter.call_count, 1)
+
+        link = octokit.Resource(self.client.session, url=url, name='Link',
+                                client=self.client)
+        self.assertFalse(link.loaded)
+        repr(link)
+        repr(link)
+        self.assertTrue(link.loaded)
+        self.assertEqual(self.adapter.call_count, 2)
+
+    def test_slots(self):
+        """Test that resources have no instance dictionary."""
+        r = octokit.Resource(None, name='Dummy', schema={'id': 1})
+        self.assertFalse(hasattr(r, '__dict__'))
+        self.assertIs(r.rels, octokit.resources.NO_RELS)
+
+    def test_keep_responses(self):
+        """Test that resources may only keep a summary of their response."""
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.adapter.register_uri('GET', url, text='{"success": true}',
+                                  headers={'X-Test': 'yes'})
+
+        self.client.keep_responses = False
+        response = self.client(param='foo')
+        assert response.success
+        self.assertIsInstance(response.response,
+                              octokit.resources.ResponseSummary)
+        self.assertEqual(response.response.status_code, 200)
+        self.assertEqual(response.response.headers['X-Test'], 'yes')
+
+    def test_eager_schema(self):
+        """Test that eager schemas match the lazy ones."""
+        url = uritemplate.expand(self.client.url, {'param': 'foo'})
+        self.adapter.register_uri('GET', url, text=(
+            '{"login": "octocat", "repos_url": "mock://api.com/repos", '
+            '"plan": {"name": "free"}, "orgs": [{"id": 1}, {"id": 2}]}'))
+
+        self.client.lazy = False
+        response = self.client(param='foo')
+        self.assertIsInstance(response.schema, dict)
+        self.assertEqual(response.login, 'octocat')
+        self.assertEqual(response.plan.name, 'free')
+        self.assertEqual(response.repos.url, 'mock://api.com/repos')
+        self.assertEqual([org.id for org in response.orgs], [1, 2])
+
 if __name__ == '__main__':
     unittest.main()
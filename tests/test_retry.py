@@ -0,0 +1,138 @@
+import unittest
+
+import requests
+import requests_mock
+import uritemplate
+
+import octokit
+
+
+class TestRetry(unittest.TestCase):
+    """Tests the functionality in octokit/retry.py"""
+
+    def setUp(self):
+        self.sleeps = []
+        self.policy = octokit.RetryPolicy(attempts=3, backoff=1,
+                                          jitter=False,
+                                          sleep=self.sleeps.append)
+        self.client = octokit.Client(api_endpoint='mock://api.com/{param}',
+                                     retry=self.policy)
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+        self.url = uritemplate.expand(self.client.url, {'param': 'foo'})
+
+    def test_server_error(self):
+        """Test that server errors are retried with exponential backoff."""
+        self.adapter.register_uri('GET', self.url, [
+            {'status_code': 502},
+            {'status_code': 503},
+            {'text': '{"success": true}'},
+        ])
+
+        response = self.client(param='foo')
+        assert response.success
+        self.assertEqual(self.sleeps, [1, 2])
+        self.assertEqual(self.policy.info(), {'retries': 2, 'failures': 0})
+
+    def test_gateway_timeout(self):
+        """Test that server errors without an exception of their own, e.g.
+        504, are retried."""
+        self.adapter.register_uri('GET', self.url, [
+            {'status_code': 504},
+            {'text': '{"success": true}'},
+        ])
+
+        response = self.client(param='foo')
+        assert response.success
+        self.assertEqual(self.adapter.call_count, 2)
+
+    def test_not_implemented(self):
+        """Test that 501 Not Implemented isn't retried."""
+        self.adapter.register_uri('GET', self.url, status_code=501)
+
+        with self.assertRaises(octokit.exceptions.NotImplemented):
+            self.client(param='foo')
+        self.assertEqual(self.adapter.call_count, 1)
+
+    def test_html_server_error(self):
+        """Test that server errors without a JSON body are retried."""
+        self.adapter.register_uri('GET', self.url, [
+            {'status_code': 502, 'reason': 'Bad Gateway',
+             'text': '<html><body>Bad Gateway</body></html>'},
+            {'text': '{"success": true}'},
+        ])
+
+        response = self.client(param='foo')
+        assert response.success
+        self.assertEqual(self.adapter.call_count, 2)
+
+    def test_network_error(self):
+        """Test that connection errors are retried."""
+        self.adapter.register_uri('GET', self.url, [
+            {'exc': requests.exceptions.ConnectionError},
+            {'text': '{"success": true}'},
+        ])
+
+        response = self.client(param='foo')
+        assert response.success
+        self.assertEqual(self.policy.retries, 1)
+
+    def test_retry_after(self):
+        """Test that the Retry-After header is honored."""
+        self.adapter.register_uri('GET', self.url, [
+            {'status_code': 503, 'headers': {'Retry-After': '7'}},
+            {'text': '{"success": true}'},
+        ])
+
+        self.client(param='foo')
+        self.assertEqual(self.sleeps, [7])
+
+    def test_attempts(self):
+        """Test that the last error is raised after the last attempt."""
+        self.adapter.register_uri('GET', self.url, status_code=500)
+
+        with self.assertRaises(octokit.exceptions.InternalServerError):
+            self.client(param='foo')
+        self.assertEqual(self.adapter.call_count, 3)
+        self.assertEqual(self.policy.info(), {'retries': 2, 'failures': 1})
+
+    def test_non_idempotent(self):
+        """Test that POST requests and client errors are not retried."""
+        self.adapter.register_uri('POST', self.url, status_code=500)
+        self.adapter.register_uri('GET', self.url, status_code=404)
+
+        with self.assertRaises(octokit.exceptions.InternalServerError):
+            self.client.post(param='foo')
+        with self.assertRaises(octokit.exceptions.NotFound):
+            self.client.get(param='foo')
+        self.assertEqual(self.adapter.call_count, 2)
+        self.assertEqual(self.sleeps, [])
+
+    def test_jitter(self):
+        policy = octokit.RetryPolicy(backoff=1, max_backoff=3)
+        for attempt in range(1, 6):
+            delay = policy.delay(octokit.exceptions.ServerError(), attempt)
+            self.assertTrue(0 <= delay <= min(3, 2 ** (attempt - 1)))
+
+    def test_pagination_resumes(self):
+        """Test that pagination resumes from the page that failed."""
+        self.client.auto_paginate = True
+        headers = {
+            'Link': '<' + self.url + '?page=2>; rel="next"',
+            'X-RateLimit-Remaining': '56',
+            'X-RateLimit-Reset': '1446804464',
+            'X-RateLimit-Limit': '60'
+        }
+        self.adapter.register_uri('GET', self.url, headers=headers,
+                                  text='["a"]')
+        self.adapter.register_uri('GET', self.url + '?page=2', [
+            {'exc': requests.exceptions.ConnectTimeout},
+            {'text': '["b"]'},
+        ])
+
+        response = self.client.paginate(param='foo')
+        self.assertEqual([r.schema for r in response.schema], ['a', 'b'])
+        self.assertEqual(self.adapter.call_count, 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import threading
+import time
+import unittest
+
+import requests_mock
+
+import octokit
+from octokit.singleflight import SingleFlight
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.001)
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Tests the functionality in octokit/singleflight.py"""
+
+    def setUp(self):
+        self.client = octokit.Client(api_endpoint='mock://api.com/',
+                                     coalesce=True)
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+        self.repo = octokit.Resource(self.client.session, name='repo',
+                                     url='mock://api.com/repos/{owner}/{repo}',
+                                     client=self.client)
+        self.release = threading.Event()
+
+    def run_threads(self, func, count=8):
+        results = [None] * count
+
+        def run(index):
+            try:
+                results[index] = func()
+            except Exception as e:
+                results[index] = e
+
+        threads = [threading.Thread(target=run, args=(i,))
+                   for i in range(count)]
+        for thread in threads:
+            thread.start()
+        wait_for(lambda: self.client.single_flight.coalesced == count - 1)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def blocking(self, text, status_code=200):
+        def callback(request, context):
+            self.release.wait(5)
+            context.status_code = status_code
+            return text
+        return callback
+
+    def test_coalesced(self):
+        """Test that concurrent identical GETs share one request."""
+        self.adapter.register_uri('GET', 'mock://api.com/repos/o/r',
+                                  text=self.blocking('{"name": "r"}'))
+
+        results = self.run_threads(lambda: self.repo.get(owner='o', repo='r'))
+
+        self.assertEqual(self.adapter.call_count, 1)
+        self.assertEqual([r.name for r in results], ['r'] * 8)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(self.client.single_flight.info(),
+                         {'calls': 1, 'coalesced': 7, 'in_flight': 0})
+
+        # Later requests are sent again
+        self.repo.get(owner='o', repo='r')
+        self.assertEqual(self.adapter.call_count, 2)
+
+    def test_coalesced_pages(self):
+        """Test that concurrent raw paginations share their requests."""
+        self.adapter.register_uri('GET', 'mock://api.com/',
+                                  text=self.blocking('["a", "b"]'))
+
+        results = self.run_threads(lambda: self.client.paginate(
+            raw=True, auto_paginate=True))
+
+        self.assertEqual(self.adapter.call_count, 1)
+        self.assertEqual(results, [['a', 'b']] * 8)
+
+    def test_shared_error(self):
+        self.adapter.register_uri('GET', 'mock://api.com/repos/o/nope',
+                                  text=self.blocking('{}', status_code=404))
+
+        results = self.run_threads(
+            lambda: self.repo.get(owner='o', repo='nope'))
+
+        self.assertEqual(self.adapter.call_count, 1)
+        for result in results:
+            self.assertIsInstance(result, octokit.exceptions.NotFound)
+
+    def test_distinct_requests(self):
+        """Test that requests differing by URL or Accept aren't coalesced."""
+        flight = SingleFlight()
+        self.client.single_flight = flight
+        self.adapter.register_uri('GET', 'mock://api.com/repos/o/r',
+                                  text='{"name": "r"}')
+        self.adapter.register_uri('GET', 'mock://api.com/repos/o/s',
+                                  text='{"name": "s"}')
+
+        self.repo.get(owner='o', repo='r')
+        self.repo.get(owner='o', repo='s')
+        self.repo.get(owner='o', repo='r',
+                      headers={'Accept': 'application/vnd.github.raw'})
+        self.assertEqual(flight.info()['calls'], 3)
+        self.assertEqual(self.adapter.call_count, 3)
+
+    def test_clients_not_shared(self):
+        """Test that requests of different clients are never coalesced."""
+        other = octokit.Client(api_endpoint='mock://api.com/',
+                               credentials=['tokenB'])
+        other.session.mount('mock', self.adapter)
+        other.single_flight = self.client.single_flight
+        self.client.credentials = octokit.CredentialPool(['tokenA'])
+        other_repo = octokit.Resource(other.session, name='repo',
+                                      url='mock://api.com/repos/{owner}/{repo}',
+                                      client=other)
+
+        def callback(request, context):
+            self.release.wait(5)
+            return '{"token": "%s"}' % request.headers['Authorization']
+        self.adapter.register_uri('GET', 'mock://api.com/repos/o/r',
+                                  text=callback)
+
+        results = [None, None]
+
+        def fetch(index, repo):
+            results[index] = repo.get(owner='o', repo='r')
+
+        threads = [threading.Thread(target=fetch, args=(0, self.repo)),
+                   threading.Thread(target=fetch, args=(1, other_repo))]
+        for thread in threads:
+            thread.start()
+        wait_for(lambda: self.client.single_flight.info()['in_flight'] == 2)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([r.token for r in results],
+                         ['token tokenA', 'token tokenB'])
+        self.assertIs(results[1].client, other)
+        self.assertEqual(self.client.single_flight.coalesced, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+
+import io
+import json
+import unittest
+
+import requests_mock
+
+import octokit
+from octokit.streaming import iter_json_array
+
+
+class TestStreaming(unittest.TestCase):
+    """Tests the functionality in octokit/streaming.py"""
+
+    def setUp(self):
+        self.client = octokit.Client(api_endpoint='mock://api.com/',
+                                     cache=octokit.MemoryCache())
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+        self.events = octokit.Resource(self.client.session, name='events',
+                                       url='mock://api.com/events{?per_page}',
+                                       client=self.client)
+
+    def test_iter_json_array(self):
+        """Test that elements split across chunks are decoded whole."""
+        data = [1, 23.5e2, 'a"b,]', {'x': [1, {'y': u'é'}]}, None,
+                True, [], u'ü' * 3, 7]
+        text = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        for size in (1, 2, 3, 7, len(text)):
+            chunks = [text[i:i + size] for i in range(0, len(text), size)]
+            self.assertEqual(list(iter_json_array(chunks)), data)
+
+        self.assertEqual(list(iter_json_array([b' [ ] '])), [])
+
+    def test_iter_json_array_errors(self):
+        for text in (b'{}', b'[1, 2', b'', b'[1 2]', b'[,1]', b'[1,,2]'):
+            with self.assertRaises(ValueError):
+                list(iter_json_array([text]))
+
+    def test_stream(self):
+        events = [{'id': str(i), 'type': 'PushEvent'} for i in range(100)]
+        body = json.dumps(events).encode('utf-8')
+        self.adapter.register_uri('GET', 'mock://api.com/events?per_page=100',
+                                  body=io.BytesIO(body),
+                                  headers={'ETag': '"abc"'})
+
+        items = self.events.stream(per_page=100, chunk_size=64)
+        first = next(items)
+        self.assertEqual(first.id, '0')
+        self.assertEqual(first._name, 'Event')
+
+        self.assertEqual([item.id for item in items],
+                         [str(i) for i in range(1, 100)])
+        # The streamed body isn't stored by the cache
+        self.assertEqual(len(self.client.cache), 0)
+
+if __name__ == '__main__':
+    unittest.main()
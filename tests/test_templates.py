@@ -0,0 +1,38 @@
+import unittest
+
+import octokit
+from octokit.templates import Template, get_template, templates
+
+
+class TestTemplates(unittest.TestCase):
+    """Tests the functionality in octokit/templates.py"""
+
+    def setUp(self):
+        templates.clear()
+
+    def test_template(self):
+        template = Template('repos/{owner}/{repo}/issues{/number}')
+        self.assertEqual(template.variables,
+                         frozenset(['owner', 'repo', 'number']))
+        self.assertEqual(template.expand({'owner': 'o', 'repo': 'r'}),
+                         'repos/o/r/issues')
+        self.assertEqual(
+            template.expand({'owner': 'o', 'repo': 'r', 'number': 1}),
+            'repos/o/r/issues/1')
+
+    def test_cache(self):
+        url = 'mock://api.com/{param}'
+        self.assertIs(get_template(url), get_template(url))
+        self.assertEqual(templates.info()['misses'], 1)
+        self.assertEqual(templates.info()['hits'], 1)
+
+    def test_shared_by_resources(self):
+        url = 'mock://api.com/users{/user}'
+        first = octokit.Resource(None, url=url)
+        second = octokit.Resource(None, url=url)
+        self.assertEqual(first.variables(), frozenset(['user']))
+        self.assertIs(first.variables(), second.variables())
+        self.assertEqual(templates.info()['misses'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
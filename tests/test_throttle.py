@@ -0,0 +1,115 @@
+import unittest
+
+import requests_mock
+import uritemplate
+
+import octokit
+from octokit.ratelimit import _RateLimit
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestThrottle(unittest.TestCase):
+    """Tests the functionality in octokit/throttle.py"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.throttle = octokit.Throttle(burst=2, clock=self.clock,
+                                         sleep=self.clock.sleep)
+        self.client = octokit.Client(api_endpoint='mock://api.com/{param}',
+                                     throttle=self.throttle)
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+        self.url = uritemplate.expand(self.client.url, {'param': 'foo'})
+
+    def rate_limit(self, remaining, resets_in):
+        rate_limit = _RateLimit()
+        rate_limit.limit = 60
+        rate_limit.remaining = remaining
+        rate_limit.resets_at = self.clock.now + resets_in
+        return rate_limit
+
+    def test_pacing(self):
+        """Test that requests are spread over the rate limit window."""
+        rate_limit = self.rate_limit(10, 100)
+        self.throttle.acquire(rate_limit)
+        self.throttle.acquire(rate_limit)
+        self.assertEqual(self.clock.sleeps, [])
+
+        # Concurrent callers queue up behind each other
+        self.throttle.sleep = self.clock.sleeps.append
+        self.throttle.acquire(rate_limit)
+        self.throttle.acquire(rate_limit)
+        self.assertEqual(self.clock.sleeps, [10, 20])
+
+    def test_exhausted(self):
+        """Test that requests wait for the reset when no budget is left."""
+        self.throttle.acquire(self.rate_limit(0, 30))
+        self.assertEqual(self.clock.sleeps, [30])
+
+    def test_unknown_rate_limit(self):
+        self.throttle.acquire(_RateLimit())
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_retry_after(self):
+        """Test that secondary rate limits are waited out and retried."""
+        self.adapter.register_uri('GET', self.url, [
+            {'status_code': 403, 'headers': {'Retry-After': '5'},
+             'text': '{"message": "You have exceeded a secondary rate limit"}'},
+            {'status_code': 200, 'text': '{"success": true}'},
+        ])
+
+        response = self.client(param='foo')
+        assert response.success
+        self.assertEqual(self.clock.sleeps, [5])
+        self.assertEqual(self.adapter.call_count, 2)
+
+    def test_exhausted_response(self):
+        """Test that requests rejected by the rate limit wait for the reset."""
+        self.adapter.register_uri('GET', self.url, [
+            {'status_code': 403, 'text': '{"message": "API rate limit"}',
+             'headers': {'X-RateLimit-Remaining': '0',
+                         'X-RateLimit-Reset': '1020',
+                         'X-RateLimit-Limit': '60'}},
+            {'status_code': 200, 'text': '{"success": true}',
+             'headers': {'X-RateLimit-Remaining': '59',
+                         'X-RateLimit-Reset': '4600',
+                         'X-RateLimit-Limit': '60'}},
+        ])
+
+        response = self.client(param='foo')
+        assert response.success
+        self.assertEqual(self.clock.sleeps, [20])
+
+    def test_unauthorized(self):
+        """Test that other errors are raised right away."""
+        self.adapter.register_uri('GET', self.url, status_code=403,
+                                  text='{"message": "Bad credentials"}')
+
+        with self.assertRaises(octokit.exceptions.Unauthorized):
+            self.client(param='foo')
+        self.assertEqual(self.adapter.call_count, 1)
+
+    def test_retries_exhausted(self):
+        self.client.throttle_retries = 1
+        self.adapter.register_uri('GET', self.url, status_code=429,
+                                  headers={'Retry-After': '1'})
+
+        with self.assertRaises(octokit.exceptions.TooManyRequests) as cm:
+            self.client(param='foo')
+        self.assertEqual(cm.exception.response.status_code, 429)
+        self.assertEqual(self.adapter.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
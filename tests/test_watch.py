@@ -0,0 +1,128 @@
+import json
+import unittest
+
+import requests_mock
+
+import octokit
+from octokit.watch import Poller
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestWatch(unittest.TestCase):
+    """Tests the functionality in octokit/watch.py"""
+
+    def setUp(self):
+        self.client = octokit.Client(api_endpoint='mock://api.com/')
+        self.adapter = requests_mock.Adapter()
+        self.client.session.mount('mock', self.adapter)
+        self.clock = FakeClock()
+        self.poller = Poller(self.client, clock=self.clock,
+                             sleep=self.clock.sleep)
+        self.events = octokit.Resource(self.client.session, name='events',
+                                       url='mock://api.com/repos/{repo}/events',
+                                       client=self.client)
+
+    def register(self, repo, responses):
+        self.adapter.register_uri(
+            'GET', 'mock://api.com/repos/%s/events' % repo, responses)
+
+    def page(self, ids, etag, poll_interval=None):
+        headers = {'ETag': etag}
+        if poll_interval:
+            headers['X-Poll-Interval'] = str(poll_interval)
+        return {'text': json.dumps([{'id': i} for i in ids]),
+                'headers': headers}
+
+    def test_new_items(self):
+        """Test that only the items added since the last poll are yielded."""
+        self.register('a', [self.page([2, 1], '"1"'),
+                            {'status_code': 304},
+                            self.page([3, 2], '"2"')])
+        watch = self.poller.watch(self.events, 'a', interval=30)
+
+        changes = self.poller.poll_due()
+        self.assertEqual([[e.id for e in r.schema] for _, r in changes],
+                         [[2, 1]])
+        self.assertEqual(changes[0][0], watch)
+        self.assertEqual(self.poller.poll_due(), [])
+
+        self.clock.now += 30
+        self.assertEqual(self.poller.poll_due(), [])
+        self.assertEqual(self.adapter.last_request.headers['If-None-Match'],
+                         '"1"')
+
+        self.clock.now += 30
+        changes = self.poller.poll_due()
+        self.assertEqual([e.id for e in changes[0][1].schema], [3])
+        self.assertEqual((watch.polls, watch.changes), (3, 2))
+
+    def test_initial(self):
+        self.register('a', [self.page([1], '"1"'), self.page([2, 1], '"2"')])
+        self.poller.watch(self.events, 'a', interval=30, initial=False)
+
+        self.assertEqual(self.poller.poll_due(), [])
+        self.clock.now += 30
+        changes = self.poller.poll_due()
+        self.assertEqual([e.id for e in changes[0][1].schema], [2])
+
+    def test_poll_interval(self):
+        """Test that X-Poll-Interval slows down polling, on one schedule."""
+        self.register('a', [self.page([1], '"1"', poll_interval=60),
+                            {'status_code': 304}])
+        self.register('b', [self.page([1], '"1"'), {'status_code': 304},
+                            self.page([2, 1], '"2"')])
+        watch_a = self.poller.watch(self.events, 'a', interval=10)
+        watch_b = self.poller.watch(self.events, 'b', interval=10)
+
+        events = iter(self.poller)
+        self.assertEqual(len([next(events), next(events)]), 2)
+        self.assertEqual(watch_a.next_at, 1060)
+        self.assertEqual(watch_b.next_at, 1010)
+
+        # The poller sleeps until the next watch is due
+        self.poller.unwatch(watch_a)
+        self.assertEqual(len(self.poller), 1)
+        watch, result = next(events)
+        self.assertEqual((watch, [e.id for e in result.schema]),
+                         (watch_b, [2]))
+        self.assertEqual(self.clock.sleeps, [10, 10])
+        self.assertEqual(watch_a.polls, 1)
+
+        self.poller.unwatch(watch_b)
+        self.assertEqual(list(events), [])
+
+    def test_errors(self):
+        """Test that failures are yielded without stopping the poller."""
+        self.register('a', [{'status_code': 404}, self.page([1], '"1"')])
+        watch = self.poller.watch(self.events, 'a', interval=30)
+
+        changes = self.poller.poll_due()
+        self.assertIsInstance(changes[0][1], octokit.exceptions.NotFound)
+        self.clock.now += 30
+        changes = self.poller.poll_due()
+        self.assertEqual([e.id for e in changes[0][1].schema], [1])
+        self.assertEqual(watch.polls, 1)
+
+    def test_client_watch(self):
+        self.adapter.register_uri('GET', 'mock://api.com/user',
+                                  text='{"login": "octocat"}')
+        user = octokit.Resource(self.client.session, name='user',
+                                url='mock://api.com/user', client=self.client)
+
+        watched = self.client.watch(user)
+        self.assertEqual(next(watched).login, 'octocat')
+
+if __name__ == '__main__':
+    unittest.main()